@@ -1,6 +1,5 @@
 #!/usr/bin/env bash
 set -euo pipefail
-shopt -s nullglob
 
 DIR="results/batch_runs"
 OUTDIR="results"
@@ -10,10 +9,13 @@ if [ ! -d "$DIR" ]; then
     exit 1
 fi
 
-for f in "$DIR"/*.json; do
-    [ -e "$f" ] || continue
-    fname=$(basename "$f")
-    outname="${fname%.json}.png"
-    echo "Processing: $f -> $OUTDIR/$outname"
-    python3 run_experiments_plot.py --metrics-file "$f" --output-file "$OUTDIR/$outname"
-done
\ No newline at end of file
+shopt -s nullglob
+metrics_files=("$DIR"/*.json)
+if [ ${#metrics_files[@]} -eq 0 ]; then
+    echo "No metrics files in $DIR, nothing to plot."
+    exit 0
+fi
+
+# One process each: per-run bar charts, then the consolidated table and scaling curves.
+python3 run_experiments_plot.py --batch-dir "$DIR" --output-dir "$OUTDIR"
+python3 run_experiments_aggregate.py --batch-dir "$DIR" --output-dir "$OUTDIR"
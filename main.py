@@ -1,8 +1,13 @@
+import bisect
 import contextlib
+import heapq
 import io
 import json
 import math
+import operator
+import random
 import time
+from collections import OrderedDict
 from pathlib import Path
 
 try:
@@ -10,6 +15,11 @@ try:
 except ImportError:  # pragma: no cover - optional dependency
     zstd = None
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
 
 class Post:
     def __init__(self, postid, timestamp, score):
@@ -23,6 +33,250 @@ class Post:
         )
 
 
+# =========================
+# READ CACHE
+# =========================
+
+class FeedReadCache:
+    """Bounded LRU cache of feed read results, invalidated lazily per query family."""
+
+    # Sorts before every (timestamp, postid) key.
+    BEFORE_ALL_KEYS = (-math.inf,)
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.versions = {"recent": 0, "popular": 0}
+        self.oldest_recent_key = None   # None while no recent result is cached
+        self.popular_cached = False
+        self.top_post = None
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return False, None
+        if entry[0] != self.versions[key[0]]:
+            del self.entries[key]
+            return False, None
+        self.entries.move_to_end(key)
+        return True, entry[1]
+
+    def put(self, key, value):
+        family = key[0]
+        if family == "recent":
+            k = key[1]
+            if k <= 0:
+                return
+            # A short result means every post is in it, so any insert changes it.
+            if len(value) < k:
+                floor = self.BEFORE_ALL_KEYS
+            else:
+                floor = (value[-1].timestamp, value[-1].postid)
+            if self.oldest_recent_key is None or floor < self.oldest_recent_key:
+                self.oldest_recent_key = floor
+        else:
+            self.popular_cached = True
+            self.top_post = value
+        self.entries[key] = (self.versions[family], value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def on_insert(self, post):
+        if self.oldest_recent_key is not None and (post.timestamp, post.postid) > self.oldest_recent_key:
+            self._bump("recent")
+        if self.popular_cached and (self.top_post is None or post.score >= self.top_post.score):
+            self._bump("popular")
+
+    def on_like(self, post):
+        if (
+            self.popular_cached
+            and self.top_post is not None
+            and post is not self.top_post
+            and post.score >= self.top_post.score
+        ):
+            self._bump("popular")
+
+    def on_delete(self, post):
+        if self.oldest_recent_key is not None and (post.timestamp, post.postid) >= self.oldest_recent_key:
+            self._bump("recent")
+        if self.popular_cached and post is self.top_post:
+            self._bump("popular")
+
+    def _bump(self, family):
+        self.versions[family] += 1
+        if family == "recent":
+            self.oldest_recent_key = None
+        else:
+            self.popular_cached = False
+            self.top_post = None
+
+
+class FeedCacheMixin:
+    """Read-cache access shared by the feeds; self.cache is None when caching is off."""
+
+    def _cache_get(self, key):
+        if self.cache is None:
+            return False, None
+        hit, value = self.cache.get(key)
+        self.stats["cache_hit_count" if hit else "cache_miss_count"] += 1
+        return hit, value
+
+    def _cache_put(self, key, value):
+        if self.cache is not None:
+            self.cache.put(key, value)
+
+
+# =========================
+# SHARED TREE HELPERS
+# =========================
+
+class TreeFeedMixin(FeedCacheMixin):
+    """Batch lookups and structural metrics shared by BSTFeed and TreapFeed."""
+
+    # ---- Batch lookups ----
+
+    def getPosts(self, keys):
+        """Batch lookup of (timestamp, postid) keys in input order, resuming each search from the last hit."""
+        start = time.perf_counter()
+        result = [None] * len(keys)
+        finger = None
+        for idx in sorted(range(len(keys)), key=keys.__getitem__):
+            finger = self._finger_search(finger, keys[idx])
+            if finger is not None and finger.key == keys[idx]:
+                result[idx] = finger.post
+        end = time.perf_counter()
+        self.stats["lookup_count"] += len(keys)
+        self.stats["lookup_time_total"] += (end - start)
+        return result
+
+    def _finger_search(self, finger, key):
+        # Climb from the finger until key falls inside the current subtree,
+        # i.e. we reach the root or come up a left edge whose parent is
+        # greater than key. Keys arrive sorted, so key >= finger.key.
+        node = finger if finger is not None else self.root
+        while node is not None and node.parent is not None:
+            if node is node.parent.left and key < node.parent.key:
+                break
+            node = node.parent
+
+        # Plain descent; returns the match or the last node visited.
+        last = node
+        while node is not None:
+            last = node
+            if key == node.key:
+                return node
+            node = node.left if key < node.key else node.right
+        return last
+
+    # ---- Structural metrics ----
+    #
+    # Every node keeps its subtree height and size, updated along the path an
+    # insert or delete touches (and locally on rotations). The readings below
+    # are O(1), except depth_histogram.
+
+    def _refresh(self, node):
+        left, right = node.left, node.right
+        size = 1 + (left.size if left is not None else 0) + (right.size if right is not None else 0)
+        node.height = 1 + max(
+            left.height if left is not None else 0,
+            right.height if right is not None else 0,
+        )
+        delta = size - node.size
+        node.size = size
+        return delta
+
+    def _fix_heights(self, node):
+        # Sizes are already right; stop once a height no longer changes.
+        while node is not None:
+            left, right = node.left, node.right
+            height = 1 + max(
+                left.height if left is not None else 0,
+                right.height if right is not None else 0,
+            )
+            if height == node.height:
+                return
+            node.height = height
+            node = node.parent
+
+    def _fix_up(self, node):
+        while node is not None:
+            self.depth_total += self._refresh(node)
+            node = node.parent
+
+    def _record_insert_path(self, depth):
+        self.depth_total += depth
+        self.insert_path_total += depth
+        self.insert_path_count += 1
+        self.insert_path_histogram[depth] = self.insert_path_histogram.get(depth, 0) + 1
+
+    def height(self):
+        return self.root.height if self.root is not None else 0
+
+    def average_depth(self):
+        return self.depth_total / self.size if self.size else 0.0
+
+    def depth_histogram(self, samples=256, rng=None):
+        """Estimated {depth: node count} from random-rank descents, at most 4 * samples * log2(n) steps."""
+        if self.root is None:
+            return {}
+        rng = rng or random
+        budget = 4 * samples * max(self.size.bit_length(), 1)
+        samples = max(1, min(samples, budget // self.height()))
+        counts = {}
+        for _ in range(samples):
+            rank = rng.randrange(self.size)
+            node = self.root
+            depth = 1
+            while True:
+                left_size = node.left.size if node.left is not None else 0
+                if rank == left_size:
+                    break
+                if rank < left_size:
+                    node = node.left
+                else:
+                    rank -= left_size + 1
+                    node = node.right
+                depth += 1
+            counts[depth] = counts.get(depth, 0) + 1
+        scale = self.size / samples
+        return {depth: count * scale for depth, count in sorted(counts.items())}
+
+    def shape_stats(self):
+        """
+        O(1) snapshot of the shape counters. The insert path histogram is the live,
+        unsorted dict; copy it before mutating the feed if it must not change.
+        """
+        stats = {
+            "size": self.size,
+            "height": self.height(),
+            "balancing_factor": self.balancing_factor(),
+            "average_depth": self.average_depth(),
+            "insert_path_histogram": self.insert_path_histogram,
+            "average_insert_path": self.insert_path_total / self.insert_path_count if self.insert_path_count else 0.0,
+        }
+        return stats
+
+    def balancing_factor(self):
+        if self.size == 0:
+            return 0.0
+        h = self.height()
+        ideal = math.ceil(math.log(self.size + 1, 2))
+        if ideal == 0:
+            return float(h)
+        return float(h) / float(ideal)
+
+    def memory_components(self):
+        """Objects the feed allocates, grouped for the memory breakdown."""
+        nodes = list(self.id_to_node.values())
+        return {
+            "Post objects": [node.post for node in nodes],
+            "Tree nodes": nodes,
+            "Key tuples": [node.key for node in nodes],
+            "id map": [self.id_to_node],
+        }
+
+
 # =========================
 # BST IMPLEMENTATION
 # =========================
@@ -34,13 +288,21 @@ class BSTNode:
         self.left = None
         self.right = None
         self.parent = None
+        self.height = 1   # nodes on the longest path down from here
+        self.size = 1     # nodes in this subtree
 
 
-class BSTFeed:
-    def __init__(self):
+class BSTFeed(TreeFeedMixin):
+    def __init__(self, cache_size=0):
         self.root = None
         self.id_to_node = {}
         self.size = 0
+        self.version = 0
+        self.cache = FeedReadCache(cache_size) if cache_size > 0 else None
+        self.depth_total = 0              # sum of node depths (root depth 1) == sum of subtree sizes
+        self.insert_path_histogram = {}   # insert path length -> count
+        self.insert_path_total = 0        # sum of insert path lengths
+        self.insert_path_count = 0
         self.stats = {
             "insert_count": 0,
             "insert_time_total": 0.0,
@@ -50,6 +312,10 @@ class BSTFeed:
             "like_time_total": 0.0,
             "get_popular_count": 0,
             "get_popular_time_total": 0.0,
+            "lookup_count": 0,
+            "lookup_time_total": 0.0,
+            "cache_hit_count": 0,
+            "cache_miss_count": 0,
         }
 
     # ---- Public API ----
@@ -61,11 +327,17 @@ class BSTFeed:
 
         if self.root is None:
             self.root = node
+            depth = 1
         else:
-            self._insert_node(self.root, node)
+            depth = self._insert_node(self.root, node)
+            self._fix_heights(node.parent)
+        self._record_insert_path(depth)
 
         self.id_to_node[postid] = node
         self.size += 1
+        self.version += 1
+        if self.cache is not None:
+            self.cache.on_insert(post)
 
         end = time.perf_counter()
         self.stats["insert_count"] += 1
@@ -76,6 +348,9 @@ class BSTFeed:
         node = self.id_to_node.get(postid)
         if node is not None:
             node.post.score += 1
+            self.version += 1
+            if self.cache is not None:
+                self.cache.on_like(node.post)
         end = time.perf_counter()
         self.stats["like_count"] += 1
         self.stats["like_time_total"] += (end - start)
@@ -87,12 +362,22 @@ class BSTFeed:
             self._delete_node(node)
             del self.id_to_node[postid]
             self.size -= 1
+            self.version += 1
+            if self.cache is not None:
+                self.cache.on_delete(node.post)
         end = time.perf_counter()
         self.stats["delete_count"] += 1
         self.stats["delete_time_total"] += (end - start)
 
     def getMostPopular(self):
         start = time.perf_counter()
+        hit, best_post = self._cache_get(("popular",))
+        if hit:
+            end = time.perf_counter()
+            self.stats["get_popular_count"] += 1
+            self.stats["get_popular_time_total"] += (end - start)
+            return best_post
+
         best_post = None
         best_score = None
 
@@ -108,6 +393,7 @@ class BSTFeed:
                 best_score = node.post.score
             node = node.right
 
+        self._cache_put(("popular",), best_post)
         end = time.perf_counter()
         self.stats["get_popular_count"] += 1
         self.stats["get_popular_time_total"] += (end - start)
@@ -115,6 +401,10 @@ class BSTFeed:
         return best_post
 
     def getMostRecent(self, k):
+        hit, cached = self._cache_get(("recent", k))
+        if hit:
+            return list(cached)
+
         result = []
         stack = []
         node = self.root
@@ -128,24 +418,29 @@ class BSTFeed:
             result.append(node.post)
             node = node.left
 
+        self._cache_put(("recent", k), list(result))
         return result
 
     # ---- Internal helpers ----
 
     def _insert_node(self, root, node):
+        # Every node on the way down gains a descendant; returns the new node's depth.
         current = root
+        depth = 1
         while True:
+            current.size += 1
+            depth += 1
             if node.key < current.key:
                 if current.left is None:
                     current.left = node
                     node.parent = current
-                    return
+                    return depth
                 current = current.left
             else:
                 if current.right is None:
                     current.right = node
                     node.parent = current
-                    return
+                    return depth
                 current = current.right
 
     def _transplant(self, u, v):
@@ -165,48 +460,26 @@ class BSTFeed:
         return current
 
     def _delete_node(self, node):
+        # Sizes and heights change from the lowest restructured node up to the root.
+        self.depth_total -= node.size
         if node.left is None:
+            lowest = node.parent
             self._transplant(node, node.right)
         elif node.right is None:
+            lowest = node.parent
             self._transplant(node, node.left)
         else:
             successor = self._minimum(node.right)
+            lowest = successor
             if successor.parent != node:
+                lowest = successor.parent
                 self._transplant(successor, successor.right)
                 successor.right = node.right
                 successor.right.parent = successor
             self._transplant(node, successor)
             successor.left = node.left
             successor.left.parent = successor
-
-    # ---- Structural metrics ----
-
-    def height(self):
-        return self._compute_height(self.root)
-
-    def _compute_height(self, node):
-        if node is None:
-            return 0
-        max_depth = 0
-        stack = [(node, 1)]
-        while stack:
-            current, depth = stack.pop()
-            if depth > max_depth:
-                max_depth = depth
-            if current.left is not None:
-                stack.append((current.left, depth + 1))
-            if current.right is not None:
-                stack.append((current.right, depth + 1))
-        return max_depth
-
-    def balancing_factor(self):
-        if self.size == 0:
-            return 0.0
-        h = self.height()
-        ideal = math.ceil(math.log(self.size + 1, 2))
-        if ideal == 0:
-            return float(h)
-        return float(h) / float(ideal)
+        self._fix_up(lowest)
 
 
 # =========================
@@ -221,13 +494,21 @@ class TreapNode:
         self.left = None
         self.right = None
         self.parent = None
+        self.height = 1   # nodes on the longest path down from here
+        self.size = 1     # nodes in this subtree
 
 
-class TreapFeed:
-    def __init__(self):
+class TreapFeed(TreeFeedMixin):
+    def __init__(self, cache_size=0):
         self.root = None
         self.id_to_node = {}
         self.size = 0
+        self.version = 0
+        self.cache = FeedReadCache(cache_size) if cache_size > 0 else None
+        self.depth_total = 0              # sum of node depths (root depth 1) == sum of subtree sizes
+        self.insert_path_histogram = {}   # insert path length -> count
+        self.insert_path_total = 0        # sum of insert path lengths
+        self.insert_path_count = 0
         self.rotation_count = 0
         self.stats = {
             "insert_count": 0,
@@ -238,6 +519,10 @@ class TreapFeed:
             "like_time_total": 0.0,
             "get_popular_count": 0,
             "get_popular_time_total": 0.0,
+            "lookup_count": 0,
+            "lookup_time_total": 0.0,
+            "cache_hit_count": 0,
+            "cache_miss_count": 0,
         }
 
     # ---- Rotations ----
@@ -258,6 +543,7 @@ class TreapFeed:
             x.parent.right = y
         y.left = x
         x.parent = y
+        self.depth_total += self._refresh(x) + self._refresh(y)
         self.rotation_count += 1
 
     def _rotate_right(self, y):
@@ -276,6 +562,7 @@ class TreapFeed:
             y.parent.right = x
         x.right = y
         y.parent = x
+        self.depth_total += self._refresh(y) + self._refresh(x)
         self.rotation_count += 1
 
     # ---- Public API ----
@@ -287,12 +574,18 @@ class TreapFeed:
 
         if self.root is None:
             self.root = node
+            depth = 1
         else:
-            self._bst_insert(node)
+            depth = self._bst_insert(node)
             self._heapify_up(node)
+            self._fix_heights(node.parent)
+        self._record_insert_path(depth)
 
         self.id_to_node[postid] = node
         self.size += 1
+        self.version += 1
+        if self.cache is not None:
+            self.cache.on_insert(post)
 
         end = time.perf_counter()
         self.stats["insert_count"] += 1
@@ -305,6 +598,10 @@ class TreapFeed:
             node.post.score += 1
             node.priority = node.post.score
             self._heapify_up(node)
+            self._fix_heights(node.parent)
+            self.version += 1
+            if self.cache is not None:
+                self.cache.on_like(node.post)
         end = time.perf_counter()
         self.stats["like_count"] += 1
         self.stats["like_time_total"] += (end - start)
@@ -316,19 +613,29 @@ class TreapFeed:
             self._delete_node(node)
             del self.id_to_node[postid]
             self.size -= 1
+            self.version += 1
+            if self.cache is not None:
+                self.cache.on_delete(node.post)
         end = time.perf_counter()
         self.stats["delete_count"] += 1
         self.stats["delete_time_total"] += (end - start)
 
     def getMostPopular(self):
         start = time.perf_counter()
-        root_post = self.root.post if self.root is not None else None
+        hit, root_post = self._cache_get(("popular",))
+        if not hit:
+            root_post = self.root.post if self.root is not None else None
+            self._cache_put(("popular",), root_post)
         end = time.perf_counter()
         self.stats["get_popular_count"] += 1
         self.stats["get_popular_time_total"] += (end - start)
         return root_post
 
     def getMostRecent(self, k):
+        hit, cached = self._cache_get(("recent", k))
+        if hit:
+            return list(cached)
+
         result = []
         stack = []
         node = self.root
@@ -342,24 +649,29 @@ class TreapFeed:
             result.append(node.post)
             node = node.left
 
+        self._cache_put(("recent", k), list(result))
         return result
 
     # ---- Internal helpers ----
 
     def _bst_insert(self, node):
+        # Every node on the way down gains a descendant; returns the new node's depth.
         current = self.root
+        depth = 1
         while True:
+            current.size += 1
+            depth += 1
             if node.key < current.key:
                 if current.left is None:
                     current.left = node
                     node.parent = current
-                    return
+                    return depth
                 current = current.left
             else:
                 if current.right is None:
                     current.right = node
                     node.parent = current
-                    return
+                    return depth
                 current = current.right
 
     def _heapify_up(self, node):
@@ -382,6 +694,7 @@ class TreapFeed:
                 else:
                     self._rotate_left(node)
         # now node is a leaf
+        self.depth_total -= node.size
         if node.parent is None:
             self.root = None
         else:
@@ -389,35 +702,296 @@ class TreapFeed:
                 node.parent.left = None
             else:
                 node.parent.right = None
+            self._fix_up(node.parent)
+
+    # ---- Structural metrics ----
+
+    def shape_stats(self):
+        stats = super().shape_stats()
+        stats["rotation_count"] = self.rotation_count
+        stats["rotations_per_op"] = self.rotation_count / self.version if self.version else 0.0
+        return stats
+
+
+# =========================
+# SORTED ARRAY IMPLEMENTATION
+# =========================
+
+class SortedArrayFeed(FeedCacheMixin):
+    """Read-optimized feed backed by NumPy arrays sorted by (timestamp, postid), refreshed in batches."""
+
+    def __init__(self, cache_size=0, batch_size=1024):
+        if np is None:
+            raise RuntimeError(
+                "SortedArrayFeed requires the optional 'numpy' package. "
+                "Install it via `pip install numpy`."
+            )
+        self.batch_size = batch_size
+        self.posts = []            # slot -> Post, None once deleted
+        self.id_to_slot = {}
+        self.buffer = {}           # (timestamp, postid) -> slot, not merged yet
+        self.buffer_keys = []      # the buffer's keys in sorted order
+        self._ts = np.empty(0, dtype=np.int64)
+        self._pid = np.empty(0, dtype=object)
+        self._score = np.empty(0, dtype=np.int64)
+        self._slot = np.empty(0, dtype=np.int64)
+        self._alive = np.empty(0, dtype=bool)
+        self._pos_of_slot = np.empty(0, dtype=np.int64)
+        self._dead_score = np.iinfo(np.int64).min
+        self.size = 0
+        self.merge_count = 0
+        self.version = 0
+        self.cache = FeedReadCache(cache_size) if cache_size > 0 else None
+        self.stats = {
+            "insert_count": 0,
+            "insert_time_total": 0.0,
+            "delete_count": 0,
+            "delete_time_total": 0.0,
+            "like_count": 0,
+            "like_time_total": 0.0,
+            "get_popular_count": 0,
+            "get_popular_time_total": 0.0,
+            "lookup_count": 0,
+            "lookup_time_total": 0.0,
+            "cache_hit_count": 0,
+            "cache_miss_count": 0,
+        }
+
+    @staticmethod
+    def available():
+        return np is not None
+
+    # ---- Public API ----
+
+    def addPost(self, postid, timestamp, score):
+        start = time.perf_counter()
+        post = Post(postid, timestamp, score)
+        slot = len(self.posts)
+        self.posts.append(post)
+        self.id_to_slot[postid] = slot
+        key = (timestamp, postid)
+        if key not in self.buffer:
+            bisect.insort(self.buffer_keys, key)
+        self.buffer[key] = slot
+        self.size += 1
+        if len(self.buffer) >= self.batch_size:
+            self._merge()
+        self.version += 1
+        if self.cache is not None:
+            self.cache.on_insert(post)
+
+        end = time.perf_counter()
+        self.stats["insert_count"] += 1
+        self.stats["insert_time_total"] += (end - start)
+
+    def likePost(self, postid):
+        start = time.perf_counter()
+        slot = self.id_to_slot.get(postid)
+        if slot is not None:
+            post = self.posts[slot]
+            post.score += 1
+            if slot < len(self._pos_of_slot) and self._pos_of_slot[slot] >= 0:
+                self._score[self._pos_of_slot[slot]] += 1
+            self.version += 1
+            if self.cache is not None:
+                self.cache.on_like(post)
+        end = time.perf_counter()
+        self.stats["like_count"] += 1
+        self.stats["like_time_total"] += (end - start)
+
+    def deletePost(self, postid):
+        start = time.perf_counter()
+        slot = self.id_to_slot.pop(postid, None)
+        if slot is not None:
+            post = self.posts[slot]
+            key = (post.timestamp, postid)
+            if self.buffer.pop(key, None) is not None:
+                del self.buffer_keys[bisect.bisect_left(self.buffer_keys, key)]
+            else:
+                pos = self._pos_of_slot[slot]
+                self._alive[pos] = False
+                self._score[pos] = self._dead_score
+            self.posts[slot] = None
+            self.size -= 1
+            self.version += 1
+            if self.cache is not None:
+                self.cache.on_delete(post)
+        end = time.perf_counter()
+        self.stats["delete_count"] += 1
+        self.stats["delete_time_total"] += (end - start)
+
+    def getMostPopular(self):
+        start = time.perf_counter()
+        hit, best_post = self._cache_get(("popular",))
+        if not hit:
+            best_post = self._best_post(0, len(self._ts), self.buffer.items())
+            self._cache_put(("popular",), best_post)
+        end = time.perf_counter()
+        self.stats["get_popular_count"] += 1
+        self.stats["get_popular_time_total"] += (end - start)
+        return best_post
+
+    def getMostRecent(self, k):
+        if k <= 0:
+            return []
+        hit, cached = self._cache_get(("recent", k))
+        if hit:
+            return list(cached)
+
+        # Widen the tail window until it holds k live entries.
+        n = len(self._ts)
+        window = min(n, k)
+        while True:
+            live = np.flatnonzero(self._alive[n - window:])
+            if len(live) >= k or window == n:
+                break
+            window = min(n, window * 2)
+        positions = (n - window + live[-k:])[::-1]
+        merged = [self.posts[slot] for slot in self._slot[positions].tolist()]
+
+        buffered = [self.posts[self.buffer[key]] for key in reversed(self.buffer_keys[-k:])]
+        # Both lists are already newest first; sorting two runs is a linear merge.
+        result = sorted(merged + buffered, key=lambda post: (post.timestamp, post.postid), reverse=True)[:k]
+        self._cache_put(("recent", k), list(result))
+        return result
+
+    def getPosts(self, keys):
+        """Batch lookup of (timestamp, postid) keys, returned in input order (None when missing)."""
+        start = time.perf_counter()
+        result = [None] * len(keys)
+        if keys and len(self._ts):
+            query_ts = np.fromiter((key[0] for key in keys), dtype=np.int64, count=len(keys))
+            lows = np.searchsorted(self._ts, query_ts, side="left")
+            highs = np.searchsorted(self._ts, query_ts, side="right")
+        for idx, key in enumerate(keys):
+            slot = self.buffer.get(key)
+            if slot is None and len(self._ts):
+                slot = self._find_merged(key[1], int(lows[idx]), int(highs[idx]))
+            if slot is not None:
+                result[idx] = self.posts[slot]
+        end = time.perf_counter()
+        self.stats["lookup_count"] += len(keys)
+        self.stats["lookup_time_total"] += (end - start)
+        return result
+
+    def findPost(self, key):
+        """Single-key lookup: the buffer, then a binary search over the merged arrays."""
+        slot = self.buffer.get(key)
+        if slot is None and len(self._ts):
+            lo = int(self._ts.searchsorted(key[0], side="left"))
+            hi = int(self._ts.searchsorted(key[0], side="right"))
+            slot = self._find_merged(key[1], lo, hi)
+        return self.posts[slot] if slot is not None else None
+
+    def getPostsInRange(self, start_ts, end_ts):
+        """Live posts with start_ts <= timestamp <= end_ts, oldest first."""
+        lo = int(np.searchsorted(self._ts, start_ts, side="left"))
+        hi = int(np.searchsorted(self._ts, end_ts, side="right"))
+        merged = [self.posts[slot] for slot in self._slot[lo:hi][self._alive[lo:hi]]]
+        buffered = [self.posts[self.buffer[key]] for key in self._buffer_range(start_ts, end_ts)]
+        return list(heapq.merge(merged, buffered, key=lambda post: (post.timestamp, post.postid)))
+
+    def getMostPopularInRange(self, start_ts, end_ts):
+        lo = int(np.searchsorted(self._ts, start_ts, side="left"))
+        hi = int(np.searchsorted(self._ts, end_ts, side="right"))
+        buffered = [(key, self.buffer[key]) for key in self._buffer_range(start_ts, end_ts)]
+        return self._best_post(lo, hi, buffered)
+
+    def flush(self):
+        """Merge the buffer now; the merge is charged to the insert time, as in addPost."""
+        start = time.perf_counter()
+        self._merge()
+        end = time.perf_counter()
+        self.stats["insert_time_total"] += (end - start)
+
+    def _merge(self):
+        """Drop tombstones and merge the buffered posts into the sorted arrays."""
+        keep = self._alive
+        ts = np.compress(keep, self._ts)
+        pid = np.compress(keep, self._pid)
+        score = np.compress(keep, self._score)
+        slot = np.compress(keep, self._slot)
+
+        batch = [(key, self.buffer[key]) for key in self.buffer_keys]
+        if batch:
+            batch_ts = np.fromiter((key[0] for key, _ in batch), dtype=np.int64, count=len(batch))
+            positions = np.searchsorted(ts, batch_ts, side="left")
+            ties = np.flatnonzero(positions != np.searchsorted(ts, batch_ts, side="right"))
+            for idx in ties:
+                # Equal timestamps already merged: order by postid inside the run.
+                lo = int(positions[idx])
+                hi = int(np.searchsorted(ts, batch_ts[idx], side="right"))
+                positions[idx] = bisect.bisect_left(pid, batch[idx][0][1], lo, hi)
+
+            batch_pid = np.empty(len(batch), dtype=object)
+            batch_pid[:] = [key[1] for key, _ in batch]
+            batch_slot = np.fromiter((s for _, s in batch), dtype=np.int64, count=len(batch))
+            batch_score = np.fromiter((self.posts[s].score for _, s in batch), dtype=np.int64, count=len(batch))
+            ts = np.insert(ts, positions, batch_ts)
+            pid = np.insert(pid, positions, batch_pid)
+            score = np.insert(score, positions, batch_score)
+            slot = np.insert(slot, positions, batch_slot)
+
+        self._ts, self._pid, self._score, self._slot = ts, pid, score, slot
+        self._alive = np.ones(len(ts), dtype=bool)
+        self._pos_of_slot = np.full(len(self.posts), -1, dtype=np.int64)
+        self._pos_of_slot[slot] = np.arange(len(slot))
+        self.buffer = {}
+        self.buffer_keys = []
+        self.merge_count += 1
+
+    # ---- Internal helpers ----
+
+    def _buffer_range(self, start_ts, end_ts):
+        lo = bisect.bisect_left(self.buffer_keys, start_ts, key=operator.itemgetter(0))
+        hi = bisect.bisect_right(self.buffer_keys, end_ts, lo, key=operator.itemgetter(0))
+        return self.buffer_keys[lo:hi]
+
+    def _find_merged(self, postid, lo, hi):
+        pos = bisect.bisect_left(self._pid, postid, lo, hi)
+        # A deleted-then-re-added post can leave a tombstone with the same key.
+        while pos < hi and self._pid[pos] == postid:
+            if self._alive[pos]:
+                return int(self._slot[pos])
+            pos += 1
+        return None
+
+    def _best_post(self, lo, hi, buffered):
+        """Highest score, ties broken by the smallest key, like BSTFeed."""
+        best_post = None
+        if hi > lo:
+            pos = lo + int(np.argmax(self._score[lo:hi]))
+            if self._alive[pos]:
+                best_post = self.posts[self._slot[pos]]
+        for key, slot in buffered:
+            post = self.posts[slot]
+            if (
+                best_post is None
+                or post.score > best_post.score
+                or (post.score == best_post.score and key < (best_post.timestamp, best_post.postid))
+            ):
+                best_post = post
+        return best_post
 
     # ---- Structural metrics ----
 
     def height(self):
-        return self._compute_height(self.root)
-
-    def _compute_height(self, node):
-        if node is None:
-            return 0
-        max_depth = 0
-        stack = [(node, 1)]
-        while stack:
-            current, depth = stack.pop()
-            if depth > max_depth:
-                max_depth = depth
-            if current.left is not None:
-                stack.append((current.left, depth + 1))
-            if current.right is not None:
-                stack.append((current.right, depth + 1))
-        return max_depth
+        """Probes of a binary search over the merged array, the analogue of tree height."""
+        return math.ceil(math.log(self.size + 1, 2)) if self.size else 0
 
     def balancing_factor(self):
-        if self.size == 0:
-            return 0.0
-        h = self.height()
-        ideal = math.ceil(math.log(self.size + 1, 2))
-        if ideal == 0:
-            return float(h)
-        return float(h) / float(ideal)
+        return 1.0 if self.size else 0.0
+
+    def memory_components(self):
+        """Objects the feed allocates, grouped for the memory breakdown."""
+        return {
+            "Post objects": [post for post in self.posts if post is not None],
+            "Sorted arrays": [self._ts, self._pid, self._score, self._slot, self._alive, self._pos_of_slot],
+            "Slot list": [self.posts],
+            "Insert buffer": [self.buffer, self.buffer_keys],
+            "Key tuples": list(self.buffer),
+            "id map": [self.id_to_slot],
+        }
 
 
 # =========================
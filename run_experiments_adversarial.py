@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Run every structure against adversarial and degenerate inputs at growing n."""
+
+import argparse
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+from run_experiments_common import (
+    ADVERSARIAL_GENERATORS,
+    SUPERLINEAR_EXPONENT,
+    print_adversarial_table,
+    run_adversarial_suite,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Stress BST and Treap with sorted, duplicate-heavy and viral inputs and flag superlinear growth."
+    )
+    parser.add_argument(
+        "--generators",
+        nargs="+",
+        choices=sorted(ADVERSARIAL_GENERATORS),
+        default=list(ADVERSARIAL_GENERATORS),
+        help="Input generators to run (default: all).",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[250, 500, 1000, 2000],
+        help="Growing sample sizes used to estimate per-op growth (default: 250 500 1000 2000).",
+    )
+    parser.add_argument("--search-trials", type=int, default=200, help="Number of tree searches per run.")
+    parser.add_argument("--delete-ratio", type=float, default=0.2, help="Fraction of posts deleted at the end of each run.")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed to keep trials reproducible.")
+    parser.add_argument(
+        "--output-file",
+        type=str,
+        default="results/adversarial.json",
+        help="Path of the JSON file with every run and the fitted exponents.",
+    )
+    args = parser.parse_args()
+
+    sizes = sorted(set(args.sizes))
+    if len(sizes) < 2:
+        parser.error("At least two distinct --sizes are needed to estimate growth.")
+
+    suite = run_adversarial_suite(args.generators, sizes, args.search_trials, args.delete_ratio, args.seed)
+    print_adversarial_table(suite)
+
+    flagged = [
+        (name, structure, key)
+        for name, per_structure in suite.items()
+        for structure, outcome in per_structure.items()
+        for key in outcome["flags"]
+    ]
+    if flagged:
+        print(f"\nSuperlinear growth (log-log exponent > {SUPERLINEAR_EXPONENT}):")
+        for name, structure, key in flagged:
+            print(f"  {structure} on {name}: {key}")
+    else:
+        print("\nNo superlinear per-op growth detected.")
+
+    payload = {
+        "metadata": {
+            "generators": args.generators,
+            "sizes": sizes,
+            "search_trials": args.search_trials,
+            "delete_ratio": args.delete_ratio,
+            "seed": args.seed,
+            "superlinear_exponent": SUPERLINEAR_EXPONENT,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        },
+        "results": suite,
+    }
+    output_path = Path(args.output_file)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    print(f"\nResults saved to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""Aggregate a directory of batch metrics files into a table, scaling fits and scaling curves."""
+
+import argparse
+import csv
+import json
+import statistics
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from run_experiments_common import MEMORY_METRIC_KEYS, METRIC_KEYS, fit_growth_exponent, parameter_hash
+
+try:
+    import matplotlib.pyplot as plt
+except ImportError:  # pragma: no cover - optional dependency
+    plt = None
+
+PARAM_COLUMNS = ["file", "structure", "dataset", "config", "sample_size", "search_trials", "delete_ratio", "seed"]
+METRIC_COLUMNS = [*METRIC_KEYS, *MEMORY_METRIC_KEYS, "Rotation Count", "Rotations per Op"]
+
+# (metric, panel title, y label, log y axis)
+SCALING_PANELS = [
+    ("Insertion Time (avg)", "Insert", "Seconds per op", True),
+    ("Deletion Time (avg)", "Delete", "Seconds per op", True),
+    ("Search Time (avg)", "Search", "Seconds per op", True),
+    ("Height of the Tree", "Height", "Nodes", True),
+    ("Retained After Inserts (bytes)", "Memory", "Bytes", True),
+]
+
+# Parameters that vary along a scaling curve; runs must agree on every other
+# parameter to share a fit.
+SCALING_AXES = ("sample_size", "seed")
+# Metadata that describes a run without affecting its results.
+RUN_METADATA = ("param_hash", "created_at", "timer_overhead", "pinned_cpu", "parameters")
+
+# A scaling fit covers the runs that share these row fields.
+GROUP_FIELDS = ("structure", "dataset", "config", "search_trials", "delete_ratio")
+GroupKey = Tuple[str, str, str, int, float]
+
+
+def config_hash(metadata: Dict[str, Any]) -> str:
+    """Hash of the parameters (minus the scaling axes) that produced a metrics file."""
+    parameters = metadata.get("parameters")
+    if parameters is None:
+        # Files written before the parameters were recorded: use the metadata itself.
+        parameters = {key: value for key, value in metadata.items() if key not in RUN_METADATA}
+    return parameter_hash({key: value for key, value in parameters.items() if key not in SCALING_AXES})
+
+
+def load_rows(batch_dir: Path) -> List[Dict[str, Any]]:
+    """Flatten every metrics file into one row per (file, structure)."""
+    rows = []
+    for metrics_path in sorted(batch_dir.glob("*.json")):
+        with open(metrics_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        metadata = data.get("metadata", {})
+        for structure, metrics in data.get("results", {}).items():
+            row = {
+                "file": metrics_path.name,
+                "structure": structure,
+                "dataset": metadata.get("dataset"),
+                "config": config_hash(metadata),
+                "sample_size": metadata.get("sample_size"),
+                "search_trials": metadata.get("search_trials"),
+                "delete_ratio": metadata.get("delete_ratio"),
+                "seed": metadata.get("seed"),
+            }
+            for key in METRIC_COLUMNS:
+                row[key] = metrics.get(key)
+            rows.append(row)
+    return rows
+
+
+def write_csv(rows: List[Dict[str, Any]], output_path: Path):
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=[*PARAM_COLUMNS, *METRIC_COLUMNS])
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def group_by_size(rows: List[Dict[str, Any]], metric: str) -> Dict[GroupKey, Dict[int, List[float]]]:
+    """{(structure, dataset, config, search_trials, delete_ratio): {n: [value per seed]}} for one metric."""
+    groups: Dict[GroupKey, Dict[int, List[float]]] = {}
+    for row in rows:
+        value = row.get(metric)
+        if value is None:
+            continue
+        key = tuple(row[field] for field in GROUP_FIELDS)
+        groups.setdefault(key, {}).setdefault(row["sample_size"], []).append(float(value))
+    return groups
+
+
+def fit_exponents(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Log-log slope of the seed-averaged metric against n, per structure and configuration."""
+    fits = []
+    for metric, _title, _ylabel, _logy in SCALING_PANELS:
+        for group, by_size in sorted(group_by_size(rows, metric).items()):
+            sizes = sorted(by_size)
+            if len(sizes) < 2:
+                continue
+            means = [statistics.fmean(by_size[n]) for n in sizes]
+            fits.append(
+                {
+                    "metric": metric,
+                    **dict(zip(GROUP_FIELDS, group)),
+                    "sizes": len(sizes),
+                    "exponent": fit_growth_exponent(sizes, means),
+                }
+            )
+    return fits
+
+
+def print_fits(fits: List[Dict[str, Any]]):
+    headers = ["Metric", "Structure", "Dataset", "Config", "Search Trials", "Delete Ratio", "Sizes", "Exponent"]
+    rows = [
+        (
+            fit["metric"],
+            fit["structure"],
+            fit["dataset"],
+            fit["config"],
+            fit["search_trials"],
+            fit["delete_ratio"],
+            fit["sizes"],
+            f"{fit['exponent']:.3f}",
+        )
+        for fit in fits
+    ]
+    col_widths = [max(len(str(item)) for item in column) for column in zip(headers, *rows)]
+
+    def format_row(row):
+        return " | ".join(str(item).ljust(width) for item, width in zip(row, col_widths))
+
+    print(format_row(headers))
+    print("-+-".join("-" * width for width in col_widths))
+    for row in rows:
+        print(format_row(row))
+
+
+def plot_scaling(rows: List[Dict[str, Any]], fits: List[Dict[str, Any]], output_path: Path) -> Path:
+    """One panel per metric: seed mean against n with a +/- one stddev band, log-log axes."""
+    if plt is None:
+        raise RuntimeError("Plotting requires matplotlib. Install it or pass --no-plot.")
+
+    exponent_by_group = {(fit["metric"], *(fit[field] for field in GROUP_FIELDS)): fit["exponent"] for fit in fits}
+    configs = {(row["dataset"], row["config"]) for row in rows}
+
+    fig, axes = plt.subplots(1, len(SCALING_PANELS), figsize=(5 * len(SCALING_PANELS), 4.5))
+    for axis, (metric, title, ylabel, logy) in zip(axes, SCALING_PANELS):
+        for group, by_size in sorted(group_by_size(rows, metric).items()):
+            structure, dataset, config, search_trials, delete_ratio = group
+            sizes = sorted(by_size)
+            means = [statistics.fmean(by_size[n]) for n in sizes]
+            spreads = [statistics.stdev(by_size[n]) if len(by_size[n]) > 1 else 0.0 for n in sizes]
+            label = structure
+            if len(configs) > 1:
+                label += f" ({dataset}, search={search_trials}, delete={delete_ratio}, config {config[:6]})"
+            exponent = exponent_by_group.get((metric, *group))
+            if exponent is not None:
+                label += f", slope {exponent:.2f}"
+            line, = axis.plot(sizes, means, marker="o", label=label)
+            axis.fill_between(
+                sizes,
+                [max(mean - spread, 0.0) for mean, spread in zip(means, spreads)],
+                [mean + spread for mean, spread in zip(means, spreads)],
+                color=line.get_color(),
+                alpha=0.2,
+            )
+        axis.set_xscale("log")
+        if logy:
+            axis.set_yscale("log")
+        axis.set_xlabel("n (posts)")
+        axis.set_ylabel(ylabel)
+        axis.set_title(title)
+        axis.legend(fontsize="small")
+
+    fig.tight_layout()
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(output_path, dpi=200, bbox_inches="tight")
+    plt.close(fig)
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Consolidate batch metrics, estimate empirical complexity exponents and plot scaling curves."
+    )
+    parser.add_argument("--batch-dir", type=str, default="results/batch_runs", help="Directory with batch metrics JSON files.")
+    parser.add_argument("--output-dir", type=str, default="results", help="Directory for the CSV files and the scaling plot.")
+    parser.add_argument("--no-plot", action="store_true", help="Only write the CSV tables.")
+    args = parser.parse_args()
+
+    batch_dir = Path(args.batch_dir)
+    if not batch_dir.is_dir():
+        parser.error(f"Directory {batch_dir} not found")
+    rows = load_rows(batch_dir)
+    if not rows:
+        parser.error(f"No metrics files found in {batch_dir}")
+
+    output_dir = Path(args.output_dir)
+    table_path = output_dir / "batch_summary.csv"
+    write_csv(rows, table_path)
+    print(f"Consolidated {len(rows)} rows into {table_path}")
+
+    fits = fit_exponents(rows)
+    if fits:
+        exponents_path = output_dir / "scaling_exponents.csv"
+        with open(exponents_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(fits[0]))
+            writer.writeheader()
+            writer.writerows(fits)
+        print("\nEmpirical complexity exponents (log-log slope of metric against n):")
+        print_fits(fits)
+        print(f"\nExponents saved to {exponents_path}")
+    else:
+        print("\nNeed at least two sample sizes per structure to fit scaling exponents.")
+
+    if not args.no_plot:
+        plot_path = plot_scaling(rows, fits, output_dir / "scaling.png")
+        print(f"Scaling curves saved to {plot_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,105 @@
+import bisect
+import collections
+import contextlib
+import gc
+import hashlib
+import json
+import math
+import os
 import random
+import statistics
+import sys
 import time
-from typing import Any, Dict, List, Sequence, Tuple
+import tracemalloc
+from typing import Any, Callable, Deque, Dict, List, Mapping, Sequence, Tuple
 
-from main import BSTFeed, TreapFeed, iter_posts_from_file
+from main import BSTFeed, SortedArrayFeed, TreapFeed, iter_posts_from_file
 
 PostTuple = Tuple[str, int, int]
 
-STRUCTURE_ORDER = ("BST", "Treap")
 STRUCTURE_CLASSES = {
     "BST": BSTFeed,
     "Treap": TreapFeed,
 }
+# The NumPy sorted-array baseline is only benchmarked when numpy is installed.
+if SortedArrayFeed.available():
+    STRUCTURE_CLASSES["SortedArray"] = SortedArrayFeed
+STRUCTURE_ORDER = tuple(STRUCTURE_CLASSES)
 
 METRIC_KEYS = [
     "Insertion Time (avg)",
     "Deletion Time (avg)",
     "Search Time (avg)",
+    "Batch Search Time (avg)",
+    "Clustered Search Time (avg)",
+    "Clustered Batch Search Time (avg)",
     "Height of the Tree",
     "Tree Balancing Factor",
+    "Average Node Depth",
+    "Average Insert Path",
 ]
-TIME_METRIC_KEYS = METRIC_KEYS[:3]
+TIME_METRIC_KEYS = METRIC_KEYS[:6]
+MEMORY_METRIC_KEYS = [
+    "Peak Memory (bytes)",
+    "Retained After Inserts (bytes)",
+    "Retained After Deletes (bytes)",
+    "Bytes per Post",
+]
+
+# Components reported by a feed's memory_components(). Bytes the feed holds
+# outside of them land in "Other".
+MEMORY_COMPONENTS = (
+    "Post objects",
+    "Tree nodes",
+    "Key tuples",
+    "Sorted arrays",
+    "Slot list",
+    "Insert buffer",
+    "id map",
+)
+
+WORKLOAD_OPS = ("insert", "like", "delete", "popular", "recent")
+ARRIVAL_MODES = ("sorted", "random", "bursty")
+PERCENTILES = (50, 90, 99)
+
+# Op ratios are relative weights, they do not need to sum to one.
+# recent_k is the inclusive (low, high) range of k passed to getMostRecent.
+WORKLOAD_PRESETS: Dict[str, Dict[str, Any]] = {
+    "balanced": {
+        "ratios": {"insert": 0.3, "like": 0.3, "delete": 0.1, "popular": 0.15, "recent": 0.15},
+        "arrival": "random",
+        "zipf_s": 1.1,
+        "recent_k": (20, 50),
+        "prefill_ratio": 0.5,
+    },
+    "read-heavy": {
+        "ratios": {"insert": 0.05, "like": 0.15, "delete": 0.02, "popular": 0.38, "recent": 0.4},
+        "arrival": "sorted",
+        "zipf_s": 1.1,
+        "recent_k": (20, 50),
+        "prefill_ratio": 0.8,
+    },
+    "write-heavy": {
+        "ratios": {"insert": 0.6, "like": 0.1, "delete": 0.2, "popular": 0.05, "recent": 0.05},
+        "arrival": "sorted",
+        "zipf_s": 1.1,
+        "recent_k": (20, 50),
+        "prefill_ratio": 0.2,
+    },
+    "like-storm": {
+        "ratios": {"insert": 0.05, "like": 0.8, "delete": 0.01, "popular": 0.1, "recent": 0.04},
+        "arrival": "bursty",
+        "zipf_s": 1.3,
+        "recent_k": (20, 50),
+        "prefill_ratio": 0.9,
+    },
+}
+
+
+def parameter_hash(params: Mapping[str, Any]) -> str:
+    """Stable short hash of experiment parameters, used to recognise finished runs."""
+    encoded = json.dumps(params, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
 
 
 def load_posts(dataset_path: str, sample_size: int) -> List[PostTuple]:
@@ -46,6 +126,409 @@ def generate_synthetic_posts(sample_size: int, seed: int) -> List[PostTuple]:
     return posts
 
 
+# ---- Adversarial / degenerate inputs ----
+#
+# Every generator returns (posts, likes): posts in insertion order and a list of
+# post ids to like once all posts are in the feed.
+
+def _uniform_input(sample_size: int, seed: int) -> Tuple[List[PostTuple], List[str]]:
+    return generate_synthetic_posts(sample_size, seed), []
+
+
+def _sorted_input(sample_size: int, seed: int) -> Tuple[List[PostTuple], List[str]]:
+    rng = random.Random(seed)
+    base_ts = int(time.time())
+    posts = [(f"sorted_{idx}", base_ts + idx, rng.randint(1, 10_000)) for idx in range(sample_size)]
+    return posts, []
+
+
+def _reverse_sorted_input(sample_size: int, seed: int) -> Tuple[List[PostTuple], List[str]]:
+    posts, likes = _sorted_input(sample_size, seed)
+    return posts[::-1], likes
+
+
+def _rising_scores_input(sample_size: int, seed: int) -> Tuple[List[PostTuple], List[str]]:
+    """Newer posts always score higher, so treap priorities follow the key order."""
+    base_ts = int(time.time())
+    posts = [(f"rising_{idx}", base_ts + idx, idx + 1) for idx in range(sample_size)]
+    return posts, []
+
+
+def _heavy_duplicates_input(sample_size: int, seed: int) -> Tuple[List[PostTuple], List[str]]:
+    """A handful of distinct timestamps and scores; keys only differ by post id."""
+    rng = random.Random(seed)
+    base_ts = int(time.time())
+    posts = [
+        (f"dup_{idx:08d}", base_ts + rng.randint(0, 7), rng.randint(1, 3))
+        for idx in range(sample_size)
+    ]
+    return posts, []
+
+
+def _viral_burst_input(sample_size: int, seed: int) -> Tuple[List[PostTuple], List[str]]:
+    """Uniform posts, then a burst of likes on the lowest scored one."""
+    posts = generate_synthetic_posts(sample_size, seed)
+    if not posts:
+        return posts, []
+    target = min(posts, key=lambda post: post[2])[0]
+    return posts, [target] * (sample_size * 2)
+
+
+ADVERSARIAL_GENERATORS: Dict[str, Callable[[int, int], Tuple[List[PostTuple], List[str]]]] = {
+    "uniform": _uniform_input,
+    "sorted": _sorted_input,
+    "reverse-sorted": _reverse_sorted_input,
+    "rising-scores": _rising_scores_input,
+    "heavy-duplicates": _heavy_duplicates_input,
+    "viral-burst": _viral_burst_input,
+}
+
+STRESS_TIME_KEYS = [
+    "Insertion Time (avg)",
+    "Like Time (avg)",
+    "Search Time (avg)",
+    "Deletion Time (avg)",
+]
+
+# Log-log slope of per-op time (or height) against n above which growth is
+# flagged. O(log n) per op stays well below this; O(n) per op sits near 1.
+SUPERLINEAR_EXPONENT = 0.5
+
+
+def fit_growth_exponent(sizes: Sequence[float], values: Sequence[float]) -> float:
+    """Least-squares slope of log(value) against log(size), skipping non-positive points."""
+    points = [(math.log(n), math.log(v)) for n, v in zip(sizes, values) if n > 0 and v > 0]
+    if len(points) < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if var_x == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+
+
+def run_stress_trial(
+    feed_cls,
+    posts: Sequence[PostTuple],
+    likes: Sequence[str],
+    search_trials: int,
+    delete_ratio: float,
+    rng: random.Random,
+) -> Dict[str, Any]:
+    """Insert in the given order, apply the likes, search, then delete a random share."""
+    feed = feed_cls()
+    for postid, timestamp, score in posts:
+        feed.addPost(postid, timestamp, score)
+    height_after_inserts = feed.height()
+    _settle(feed)
+
+    for postid in likes:
+        feed.likePost(postid)
+
+    keys = [(timestamp, postid) for (postid, timestamp, _score) in posts]
+    sample_keys = rng.sample(keys, min(search_trials, len(keys)))
+    search_total = _time_root_searches(feed, sample_keys)
+
+    delete_count = int(len(posts) * delete_ratio)
+    if delete_count > 0:
+        for postid in rng.sample([pid for pid, _, _ in posts], delete_count):
+            feed.deletePost(postid)
+
+    return {
+        "Insertion Time (avg)": feed.stats["insert_time_total"] / max(feed.stats["insert_count"], 1),
+        "Like Time (avg)": feed.stats["like_time_total"] / max(feed.stats["like_count"], 1),
+        "Search Time (avg)": search_total / max(len(sample_keys), 1),
+        "Deletion Time (avg)": feed.stats["delete_time_total"] / max(feed.stats["delete_count"], 1),
+        "Height After Inserts": height_after_inserts,
+        "Height of the Tree": feed.height(),
+    }
+
+
+def run_adversarial_suite(
+    generators: Sequence[str],
+    sizes: Sequence[int],
+    search_trials: int,
+    delete_ratio: float,
+    seed: int,
+) -> Dict[str, Dict[str, Any]]:
+    """Run every structure against every named generator at each size and fit growth exponents."""
+    suite: Dict[str, Dict[str, Any]] = {}
+    for name in generators:
+        generator = ADVERSARIAL_GENERATORS[name]
+        inputs = {n: generator(n, seed) for n in sizes}
+        suite[name] = {}
+        for structure in STRUCTURE_ORDER:
+            runs = []
+            for n in sizes:
+                posts, likes = inputs[n]
+                metrics = run_stress_trial(
+                    STRUCTURE_CLASSES[structure], posts, likes, search_trials, delete_ratio, random.Random(seed)
+                )
+                metrics["n"] = n
+                runs.append(metrics)
+
+            exponents = {}
+            for key in [*STRESS_TIME_KEYS, "Height After Inserts"]:
+                values = [run[key] for run in runs]
+                exponents[key] = fit_growth_exponent(sizes, values)
+            flags = [key for key, exponent in exponents.items() if exponent > SUPERLINEAR_EXPONENT]
+            suite[name][structure] = {"runs": runs, "exponents": exponents, "flags": flags}
+    return suite
+
+
+def arrange_arrivals(posts: Sequence[PostTuple], mode: str, rng: random.Random) -> List[PostTuple]:
+    """Return the posts in arrival order: sorted, shuffled, or sorted in bursts of close timestamps."""
+    if mode not in ARRIVAL_MODES:
+        raise ValueError(f"Unknown arrival mode '{mode}', expected one of {ARRIVAL_MODES}")
+    if mode == "random":
+        arranged = list(posts)
+        rng.shuffle(arranged)
+        return arranged
+
+    arranged = sorted(posts, key=lambda post: (post[1], post[0]))
+    if mode == "sorted" or not arranged:
+        return arranged
+
+    bursty: List[PostTuple] = []
+    timestamp = arranged[0][1]
+    idx = 0
+    while idx < len(arranged):
+        burst_size = rng.randint(1, 64)
+        for postid, _timestamp, score in arranged[idx:idx + burst_size]:
+            bursty.append((postid, timestamp + rng.randint(0, 5), score))
+        idx += burst_size
+        timestamp += rng.randint(600, 3_600)
+    bursty.sort(key=lambda post: (post[1], post[0]))
+    return bursty
+
+
+class ZipfSampler:
+    """Draw ranks in [0, n) with probability proportional to 1 / (rank + 1) ** s."""
+
+    def __init__(self, n: int, s: float, rng: random.Random):
+        self.rng = rng
+        self.cumulative: List[float] = []
+        total = 0.0
+        for rank in range(max(n, 1)):
+            total += 1.0 / (rank + 1) ** s
+            self.cumulative.append(total)
+
+    def sample(self, population: int) -> int:
+        """Return a rank below population, which must not exceed n."""
+        upper = self.cumulative[population - 1]
+        return bisect.bisect_left(self.cumulative, self.rng.random() * upper, 0, population - 1)
+
+
+class LiveOrder:
+    """
+    Live posts in insertion order. Removals leave a tombstone, and a Fenwick
+    tree over the live flags finds the post at a given recency rank in O(log n).
+    """
+
+    def __init__(self, capacity: int):
+        self.posts: List[Any] = []
+        self.index: Dict[str, int] = {}
+        self.tree = [0] * (capacity + 1)
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, post: PostTuple):
+        self.index[post[0]] = len(self.posts)
+        self.posts.append(post)
+        self._update(len(self.posts), 1)
+
+    def remove(self, postid: str):
+        idx = self.index.pop(postid)
+        self.posts[idx] = None
+        self._update(idx + 1, -1)
+
+    def latest(self, rank: int) -> PostTuple:
+        """The live post with rank newer posts after it (rank 0 is the newest)."""
+        # Binary lifting for the (count - rank)-th live flag.
+        target = self.count - rank
+        pos = 0
+        step = 1 << (len(self.tree) - 1).bit_length()
+        while step:
+            if pos + step < len(self.tree) and self.tree[pos + step] < target:
+                pos += step
+                target -= self.tree[pos]
+            step >>= 1
+        return self.posts[pos]
+
+    def _update(self, pos: int, delta: int):
+        self.count += delta
+        while pos < len(self.tree):
+            self.tree[pos] += delta
+            pos += pos & -pos
+
+
+def _percentile(sorted_values: Sequence[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def summarize_latencies(samples: Sequence[float]) -> Dict[str, Any]:
+    ordered = sorted(samples)
+    summary: Dict[str, Any] = {
+        "count": len(ordered),
+        "mean": sum(ordered) / max(len(ordered), 1),
+    }
+    for pct in PERCENTILES:
+        summary[f"p{pct}"] = _percentile(ordered, pct)
+    summary["max"] = ordered[-1] if ordered else 0.0
+    return summary
+
+
+def run_workload(
+    feed_cls,
+    posts: Sequence[PostTuple],
+    workload: Dict[str, Any],
+    operations: int,
+    rng: random.Random,
+    cache_size: int = 0,
+) -> Dict[str, Any]:
+    """Prefill a feed, then replay a randomized interleaving of feed operations."""
+    arrivals = arrange_arrivals(posts, workload["arrival"], rng)
+    prefill = int(len(arrivals) * workload["prefill_ratio"])
+    pending = list(reversed(arrivals[prefill:]))
+    requeued: Deque[PostTuple] = collections.deque()
+    horizon = max((post[1] for post in arrivals), default=0)
+    live = LiveOrder(prefill + operations)
+
+    feed = feed_cls(cache_size=cache_size) if cache_size > 0 else feed_cls()
+    for post in arrivals[:prefill]:
+        feed.addPost(*post)
+        live.append(post)
+
+    ops = [op for op in WORKLOAD_OPS if workload["ratios"].get(op, 0) > 0]
+    weights = [workload["ratios"][op] for op in ops]
+    zipf = ZipfSampler(len(arrivals), workload["zipf_s"], rng)
+    recent_low, recent_high = workload["recent_k"]
+    latencies: Dict[str, List[float]] = {op: [] for op in WORKLOAD_OPS}
+
+    plan = rng.choices(ops, weights=weights, k=operations)
+    wall_start = time.perf_counter()
+    for op in plan:
+        if op == "insert" and not (pending or requeued):
+            op = "like" if live else "recent"
+        elif op in ("like", "delete") and not live:
+            op = "insert" if pending or requeued else "recent"
+
+        if op == "insert":
+            post = pending.pop() if pending else requeued.popleft()
+            start = time.perf_counter()
+            feed.addPost(*post)
+            end = time.perf_counter()
+            live.append(post)
+        elif op == "like":
+            postid = live.latest(zipf.sample(len(live)))[0]
+            start = time.perf_counter()
+            feed.likePost(postid)
+            end = time.perf_counter()
+        elif op == "delete":
+            post = live.latest(rng.randrange(len(live)))
+            start = time.perf_counter()
+            feed.deletePost(post[0])
+            end = time.perf_counter()
+            live.remove(post[0])
+            if workload["arrival"] == "random":
+                slot = rng.randint(0, len(pending))
+                if slot < len(pending):
+                    pending.append(pending[slot])
+                    pending[slot] = post
+                else:
+                    pending.append(post)
+            else:
+                horizon += 1
+                requeued.append((post[0], horizon, post[2]))
+        elif op == "popular":
+            start = time.perf_counter()
+            feed.getMostPopular()
+            end = time.perf_counter()
+        else:
+            k = rng.randint(recent_low, recent_high)
+            start = time.perf_counter()
+            feed.getMostRecent(k)
+            end = time.perf_counter()
+        latencies[op].append(end - start)
+    wall_time = time.perf_counter() - wall_start
+
+    total_ops = sum(len(samples) for samples in latencies.values())
+    feed_time = sum(sum(samples) for samples in latencies.values())
+    report = {
+        "Total Ops": total_ops,
+        "Throughput (ops/sec)": total_ops / feed_time if feed_time > 0 else 0.0,
+        "Wall Throughput (ops/sec)": total_ops / wall_time if wall_time > 0 else 0.0,
+        "Latency": {op: summarize_latencies(samples) for op, samples in latencies.items() if samples},
+        "Final Size": feed.size,
+    }
+    if cache_size > 0:
+        hits = feed.stats["cache_hit_count"]
+        lookups = hits + feed.stats["cache_miss_count"]
+        report["Cache Hit Rate"] = hits / lookups if lookups else 0.0
+    return report
+
+
+def validate_against_oracle(
+    feed_cls,
+    posts: Sequence[PostTuple],
+    operations: int,
+    rng: random.Random,
+    oracle_cls=SortedArrayFeed,
+) -> Dict[str, Any]:
+    """Replay random writes and reads on a feed and on the sorted-array oracle and compare every read."""
+    feed = feed_cls()
+    oracle = oracle_cls()
+    pending = list(posts)
+    rng.shuffle(pending)
+    live: List[PostTuple] = []
+    checks = 0
+    mismatches: List[Dict[str, Any]] = []
+
+    def ids(found):
+        return [post.postid if post is not None else None for post in found]
+
+    for step in range(operations):
+        roll = rng.random()
+        if pending and (roll < 0.3 or not live):
+            post = pending.pop()
+            feed.addPost(*post)
+            oracle.addPost(*post)
+            live.append(post)
+        elif roll < 0.6 and live:
+            postid = live[rng.randrange(len(live))][0]
+            feed.likePost(postid)
+            oracle.likePost(postid)
+        elif roll < 0.7 and live:
+            post = live.pop(rng.randrange(len(live)))
+            feed.deletePost(post[0])
+            oracle.deletePost(post[0])
+        else:
+            checks += 1
+            query = rng.choice(("recent", "popular", "lookup"))
+            if query == "recent":
+                k = rng.randint(1, 50)
+                expected, actual = ids(oracle.getMostRecent(k)), ids(feed.getMostRecent(k))
+            elif query == "popular":
+                best, found = oracle.getMostPopular(), feed.getMostPopular()
+                expected = best.score if best is not None else None
+                actual = found.score if found is not None else None
+            else:
+                keys = [(timestamp, postid) for postid, timestamp, _ in rng.sample(posts, min(20, len(posts)))]
+                expected, actual = ids(oracle.getPosts(keys)), ids(feed.getPosts(keys))
+            if expected != actual:
+                mismatches.append({"step": step, "query": query, "expected": expected, "actual": actual})
+
+    return {"operations": operations, "checks": checks, "mismatches": len(mismatches), "examples": mismatches[:5]}
+
+
 def _search_by_key(node, key):
     """Standard BST search that works for both BSTNode and TreapNode."""
     current = node
@@ -59,63 +542,396 @@ def _search_by_key(node, key):
     return None
 
 
+def _settle(feed):
+    """Merge a buffered feed's inserts so timed searches hit its sorted arrays."""
+    if hasattr(feed, "flush"):
+        feed.flush()
+
+
+def _time_root_searches(feed, keys: Sequence[Tuple[int, str]]) -> float:
+    """Total time of one root-to-node descent per key (findPost for feeds without a tree)."""
+    total = 0.0
+    if not hasattr(feed, "root"):
+        for key in keys:
+            start = time.perf_counter()
+            feed.findPost(key)
+            end = time.perf_counter()
+            total += end - start
+        return total
+    for key in keys:
+        start = time.perf_counter()
+        _search_by_key(feed.root, key)
+        end = time.perf_counter()
+        total += end - start
+    return total
+
+
+def _time_batch_lookup(feed, keys: Sequence[Tuple[int, str]]) -> float:
+    """Total time of a single getPosts call over all keys."""
+    start = time.perf_counter()
+    feed.getPosts(keys)
+    end = time.perf_counter()
+    return end - start
+
+
 def run_trial(
     feed_cls,
     posts: Sequence[PostTuple],
     search_trials: int,
     delete_ratio: float,
     rng: random.Random,
+    timer_overhead: float = 0.0,
+    measure_memory: bool = False,
 ) -> Dict[str, Any]:
+    """Insert every post, time key searches, then delete a random share."""
     feed = feed_cls()
     for postid, timestamp, score in posts:
         feed.addPost(postid, timestamp, score)
+    _settle(feed)
 
     keys = [(timestamp, postid) for (postid, timestamp, _score) in posts]
     sample_keys = rng.sample(keys, min(search_trials, len(keys)))
+    # A contiguous time window, the access pattern of timeline hydration.
+    sorted_keys = sorted(keys)
+    window_start = rng.randrange(max(len(sorted_keys) - len(sample_keys), 0) + 1)
+    clustered_keys = sorted_keys[window_start:window_start + len(sample_keys)]
 
-    search_total = 0.0
-    for key in sample_keys:
-        start = time.perf_counter()
-        _search_by_key(feed.root, key)
-        end = time.perf_counter()
-        search_total += end - start
+    search_total = _time_root_searches(feed, sample_keys)
+    batch_total = _time_batch_lookup(feed, sample_keys)
+    clustered_total = _time_root_searches(feed, clustered_keys)
+    clustered_batch_total = _time_batch_lookup(feed, clustered_keys)
 
     delete_count = int(len(posts) * delete_ratio)
+    to_delete: List[str] = []
     if delete_count > 0:
         to_delete = rng.sample([pid for pid, _, _ in posts], delete_count)
         for postid in to_delete:
             feed.deletePost(postid)
 
+    insert_avg = feed.stats["insert_time_total"] / max(feed.stats["insert_count"], 1)
+    delete_avg = feed.stats["delete_time_total"] / max(feed.stats["delete_count"], 1)
+    search_avg = search_total / max(len(sample_keys), 1)
+    lookups = max(len(sample_keys), 1)
     metrics: Dict[str, Any] = {
-        "Insertion Time (avg)": feed.stats["insert_time_total"] / max(feed.stats["insert_count"], 1),
-        "Deletion Time (avg)": feed.stats["delete_time_total"] / max(feed.stats["delete_count"], 1),
-        "Search Time (avg)": search_total / max(len(sample_keys), 1),
+        "Insertion Time (avg)": max(insert_avg - timer_overhead, 0.0),
+        "Deletion Time (avg)": max(delete_avg - timer_overhead, 0.0),
+        "Search Time (avg)": max(search_avg - timer_overhead, 0.0),
+        "Batch Search Time (avg)": max((batch_total - timer_overhead) / lookups, 0.0),
+        "Clustered Search Time (avg)": max(clustered_total / lookups - timer_overhead, 0.0),
+        "Clustered Batch Search Time (avg)": max((clustered_batch_total - timer_overhead) / lookups, 0.0),
         "Height of the Tree": feed.height(),
         "Tree Balancing Factor": feed.balancing_factor(),
     }
+    if hasattr(feed, "shape_stats"):
+        shape = feed.shape_stats()
+        metrics["Average Node Depth"] = shape["average_depth"]
+        metrics["Average Insert Path"] = shape["average_insert_path"]
+        if "rotations_per_op" in shape:
+            metrics["Rotations per Op"] = shape["rotations_per_op"]
     if hasattr(feed, "rotation_count"):
         metrics["Rotation Count"] = feed.rotation_count
+    if measure_memory:
+        metrics.update(measure_feed_memory(feed_cls, posts, to_delete))
     return metrics
 
 
+def _instance_footprint(cls: type, attributes: Sequence[str], copies: int = 64) -> float:
+    """Traced bytes per instance of cls with the given attributes set. Needs tracemalloc stopped."""
+    clones = [None] * copies
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        for idx in range(copies):
+            clone = cls.__new__(cls)
+            for name in attributes:
+                setattr(clone, name, None)
+            clones[idx] = clone
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (after - before) / copies
+
+
+def _walk_components(feed) -> Tuple[Dict[str, int], Dict[Tuple[str, type], int], Dict[type, List[str]]]:
+    """Size the objects a feed lists in memory_components(), counting its own instances per class."""
+    module = type(feed).__module__
+    sized = {component: 0 for component in MEMORY_COMPONENTS}
+    instance_counts: Dict[Tuple[str, type], int] = {}
+    attributes: Dict[type, List[str]] = {}
+    for component, objects in feed.memory_components().items():
+        for obj in objects:
+            cls = type(obj)
+            if cls.__module__ == module:
+                instance_counts[(component, cls)] = instance_counts.get((component, cls), 0) + 1
+                if cls not in attributes:
+                    attributes[cls] = list(vars(obj))
+            else:
+                sized[component] += sys.getsizeof(obj)
+    return sized, instance_counts, attributes
+
+
+def measure_feed_memory(feed_cls, posts: Sequence[PostTuple], to_delete: Sequence[str]) -> Dict[str, Any]:
+    """Replay inserts then deletes under tracemalloc and break the post-insert bytes down by component."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        feed = feed_cls()
+        for postid, timestamp, score in posts:
+            feed.addPost(postid, timestamp, score)
+        after_inserts, insert_peak = tracemalloc.get_traced_memory()
+        held_posts = feed.size
+
+        # The walk allocates too, so rebase before the deletes.
+        sized, instance_counts, attributes = _walk_components(feed)
+        gc.collect()
+        tracemalloc.reset_peak()
+        rebase, _ = tracemalloc.get_traced_memory()
+
+        for postid in to_delete:
+            feed.deletePost(postid)
+        gc.collect()
+        current, delete_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    footprints = {cls: _instance_footprint(cls, names) for cls, names in attributes.items()}
+    breakdown = dict(sized)
+    for (component, cls), count in instance_counts.items():
+        breakdown[component] += int(count * footprints[cls])
+
+    after_deletes = after_inserts + current - rebase
+    peak = max(insert_peak, after_inserts + delete_peak - rebase)
+    retained_after_inserts = after_inserts - baseline
+    breakdown["Other"] = max(retained_after_inserts - sum(breakdown.values()), 0)
+    held = max(held_posts, 1)
+    return {
+        "Peak Memory (bytes)": peak - baseline,
+        "Retained After Inserts (bytes)": retained_after_inserts,
+        "Retained After Deletes (bytes)": after_deletes - baseline,
+        "Bytes per Post": retained_after_inserts / held,
+        "Memory Breakdown": breakdown,
+        "Deep Size per Post (bytes)": {
+            component: size / held for component, size in breakdown.items() if size and component != "Other"
+        },
+    }
+
+
+# ---- Measurement harness ----
+
+# Two-sided 95% Student t critical values by degrees of freedom. Degrees of
+# freedom between rows use the next smaller row, whose value is larger, so
+# the interval errs on the wide side.
+T_CRITICAL_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306,
+    9: 2.262, 10: 2.228, 11: 2.201, 12: 2.179, 13: 2.160, 14: 2.145, 15: 2.131,
+    16: 2.120, 17: 2.110, 18: 2.101, 19: 2.093, 20: 2.086, 25: 2.060, 30: 2.042,
+    40: 2.021, 60: 2.000, 120: 1.980,
+}
+
+
+T_CRITICAL_DOFS = sorted(T_CRITICAL_95)
+
+
+def _t_critical(dof: int) -> float:
+    idx = bisect.bisect_right(T_CRITICAL_DOFS, dof) - 1
+    return T_CRITICAL_95[T_CRITICAL_DOFS[max(idx, 0)]]
+
+
+def calibrate_timer_overhead(samples: int = 20_000) -> float:
+    """Median cost of back-to-back perf_counter() calls, in seconds."""
+    deltas = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        end = time.perf_counter()
+        deltas.append(end - start)
+    return statistics.median(deltas)
+
+
+@contextlib.contextmanager
+def gc_paused(disable: bool):
+    """Disable the cyclic garbage collector for the duration of the block."""
+    was_enabled = gc.isenabled()
+    if disable:
+        gc.collect()
+        gc.disable()
+    try:
+        yield
+    finally:
+        if disable and was_enabled:
+            gc.enable()
+
+
+def pin_cpu(cpu: int):
+    """Pin the current process to a single CPU where the platform allows it."""
+    if not hasattr(os, "sched_setaffinity"):
+        raise RuntimeError("CPU pinning requires os.sched_setaffinity, which this platform lacks.")
+    os.sched_setaffinity(0, {cpu})
+
+
+def summarize_samples(values: Sequence[float]) -> Dict[str, float]:
+    """Mean, median, sample stddev and a Student-t 95% confidence interval."""
+    mean = statistics.fmean(values)
+    stdev = statistics.stdev(values) if len(values) > 1 else 0.0
+    half_width = _t_critical(len(values) - 1) * stdev / math.sqrt(len(values)) if len(values) > 1 else 0.0
+    return {
+        "n": len(values),
+        "mean": mean,
+        "median": statistics.median(values),
+        "stdev": stdev,
+        "ci95_low": mean - half_width,
+        "ci95_high": mean + half_width,
+    }
+
+
+def run_measured_trial(
+    feed_cls,
+    posts: Sequence[PostTuple],
+    search_trials: int,
+    delete_ratio: float,
+    seed: int,
+    repeats: int = 1,
+    warmup: int = 0,
+    disable_gc: bool = False,
+    timer_overhead: float = 0.0,
+    measure_memory: bool = True,
+) -> Dict[str, Any]:
+    """Repeat run_trial on the same seed and aggregate the timed repeats."""
+    samples: List[Dict[str, Any]] = []
+    for iteration in range(warmup + repeats):
+        with gc_paused(disable_gc):
+            metrics = run_trial(
+                feed_cls,
+                posts,
+                search_trials,
+                delete_ratio,
+                random.Random(seed),
+                timer_overhead,
+                # Memory is deterministic for a seed: the first timed repeat measures it.
+                measure_memory=measure_memory and iteration == warmup,
+            )
+        if iteration >= warmup:
+            samples.append(metrics)
+
+    aggregated: Dict[str, Any] = {}
+    summaries: Dict[str, Dict[str, float]] = {}
+    for key, value in samples[0].items():
+        if isinstance(value, (int, float)):
+            summary = summarize_samples([sample[key] for sample in samples if key in sample])
+            summaries[key] = summary
+            aggregated[key] = summary["mean"] if isinstance(value, float) else value
+        else:
+            aggregated[key] = value
+    aggregated["Statistics"] = summaries
+    return aggregated
+
+
 def print_results_table(results: Dict[str, Dict[str, Any]], structures: Sequence[str]):
     headers = ["Metric", *structures]
     rows = []
     for key in METRIC_KEYS:
         row = [key]
         for structure in structures:
-            value = results[structure][key]
-            if isinstance(value, float):
+            value = results[structure].get(key, "-")
+            summary = results[structure].get("Statistics", {}).get(key)
+            half_width = (summary["ci95_high"] - summary["ci95_low"]) / 2 if summary else 0.0
+            if isinstance(value, float) and half_width > 0:
+                row.append(f"{value:.6f} ± {half_width:.1e}")
+            elif isinstance(value, float):
                 row.append(f"{value:.6f}")
             else:
                 row.append(str(value))
         rows.append(tuple(row))
 
-    if any("Rotation Count" in results[structure] for structure in structures):
-        rotation_row = ["Rotation Count"]
+    for key in MEMORY_METRIC_KEYS:
+        if not all(key in results[structure] for structure in structures):
+            continue
+        row = [key]
         for structure in structures:
-            rotation_row.append(str(results[structure].get("Rotation Count", "-")))
-        rows.append(tuple(rotation_row))
+            value = results[structure][key]
+            row.append(f"{value:.1f}" if isinstance(value, float) else str(value))
+        rows.append(tuple(row))
+
+    breakdowns = [results[structure].get("Memory Breakdown") for structure in structures]
+    if all(breakdowns):
+        for component in breakdowns[0]:
+            rows.append(
+                (f"  {component} (bytes)", *(str(breakdown.get(component, "-")) for breakdown in breakdowns))
+            )
+
+    for key in ("Rotation Count", "Rotations per Op"):
+        if any(key in results[structure] for structure in structures):
+            rotation_row = [key]
+            for structure in structures:
+                value = results[structure].get(key, "-")
+                rotation_row.append(f"{value:.6f}" if isinstance(value, float) else str(value))
+            rows.append(tuple(rotation_row))
+
+    col_widths = [max(len(str(item)) for item in column) for column in zip(headers, *rows)]
+
+    def format_row(row):
+        return " | ".join(str(item).ljust(width) for item, width in zip(row, col_widths))
+
+    print(format_row(headers))
+    print("-+-".join("-" * width for width in col_widths))
+    for row in rows:
+        print(format_row(row))
+
+
+def print_workload_table(results: Dict[str, Dict[str, Any]], structures: Sequence[str]):
+    headers = ["Op", "Stat", *structures]
+    rows = [
+        ("all", "ops/sec", *(f"{results[structure]['Throughput (ops/sec)']:.1f}" for structure in structures)),
+        (
+            "all",
+            "wall ops/sec",
+            *(f"{results[structure]['Wall Throughput (ops/sec)']:.1f}" for structure in structures),
+        ),
+    ]
+    if any("Cache Hit Rate" in results[structure] for structure in structures):
+        rows.append(
+            (
+                "reads",
+                "cache hit rate",
+                *(
+                    f"{results[structure]['Cache Hit Rate']:.3f}" if "Cache Hit Rate" in results[structure] else "-"
+                    for structure in structures
+                ),
+            )
+        )
+    stats = ["count", "mean", *(f"p{pct}" for pct in PERCENTILES), "max"]
+    for op in WORKLOAD_OPS:
+        if not any(op in results[structure]["Latency"] for structure in structures):
+            continue
+        for stat in stats:
+            row = [op, stat]
+            for structure in structures:
+                value = results[structure]["Latency"].get(op, {}).get(stat, "-")
+                row.append(f"{value:.9f}" if isinstance(value, float) else str(value))
+            rows.append(tuple(row))
+
+    col_widths = [max(len(str(item)) for item in column) for column in zip(headers, *rows)]
+
+    def format_row(row):
+        return " | ".join(str(item).ljust(width) for item, width in zip(row, col_widths))
+
+    print(format_row(headers))
+    print("-+-".join("-" * width for width in col_widths))
+    for row in rows:
+        print(format_row(row))
+
+
+def print_adversarial_table(suite: Dict[str, Dict[str, Any]]):
+    headers = ["Generator", "Structure", "Metric", "Exponent", "Values by n"]
+    rows = []
+    for name, per_structure in suite.items():
+        for structure, outcome in per_structure.items():
+            for key, exponent in outcome["exponents"].items():
+                marker = " !" if key in outcome["flags"] else ""
+                values = ", ".join(
+                    f"{run['n']}:{run[key]:.3g}" for run in outcome["runs"]
+                )
+                rows.append((name, structure, key, f"{exponent:.2f}{marker}", values))
 
     col_widths = [max(len(str(item)) for item in column) for column in zip(headers, *rows)]
 
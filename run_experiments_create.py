@@ -1,21 +1,30 @@
 import argparse
 import json
+import os
 import random
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Mapping
+from typing import Any, Dict, Mapping, Optional, Sequence
 
 from run_experiments_common import (
+    ARRIVAL_MODES,
     STRUCTURE_CLASSES,
     STRUCTURE_ORDER,
+    WORKLOAD_PRESETS,
+    calibrate_timer_overhead,
     generate_synthetic_posts,
     load_posts,
+    parameter_hash,
+    pin_cpu,
     print_results_table,
-    run_trial,
+    print_workload_table,
+    run_measured_trial,
+    run_workload,
+    validate_against_oracle,
 )
 
 
-def main():
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Run identical workloads on BST and Treap and save the collected metrics."
     )
@@ -35,23 +44,107 @@ def main():
         default=None,
         help="Full path for the metrics JSON file (overrides --output-dir).",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--workload",
+        choices=sorted(WORKLOAD_PRESETS),
+        default=None,
+        help="Also run a mixed insert/like/delete/getMostPopular/getMostRecent workload preset.",
+    )
+    parser.add_argument("--operations", type=int, default=10_000, help="Number of operations in the mixed workload and the oracle check.")
+    parser.add_argument(
+        "--arrival",
+        choices=ARRIVAL_MODES,
+        default=None,
+        help="Override the timestamp arrival pattern of the workload preset.",
+    )
+    parser.add_argument("--zipf-s", type=float, default=None, help="Override the Zipf exponent used to pick liked posts.")
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=0,
+        help="Also run the workload with a read cache of this many entries and report its hit rate.",
+    )
+    parser.add_argument(
+        "--validate-oracle",
+        action="store_true",
+        help="Cross-check every tree against the NumPy sorted-array feed over --operations random ops.",
+    )
+    parser.add_argument("--repeats", type=int, default=1, help="Timed repetitions of the trial per structure.")
+    parser.add_argument("--warmup", type=int, default=0, help="Untimed warmup repetitions run before the timed ones.")
+    parser.add_argument("--disable-gc", action="store_true", help="Disable the garbage collector during timed trials.")
+    parser.add_argument("--pin-cpu", type=int, default=None, help="Pin the process to this CPU index before measuring.")
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="Skip the tracemalloc replay that measures the memory footprint (timings only).",
+    )
+    parser.add_argument(
+        "--no-timer-correction",
+        action="store_true",
+        help="Do not subtract the calibrated perf_counter overhead from per-op times.",
+    )
+    return parser
 
-    if args.dataset:
-        dataset_path = Path(args.dataset)
-        if not dataset_path.is_file():
-            parser.error(f"Dataset file '{dataset_path}' does not exist.")
-        posts = load_posts(str(dataset_path), args.sample_size)
-    else:
-        posts = generate_synthetic_posts(args.sample_size, args.seed)
 
+def validate_args(parser: argparse.ArgumentParser, args: argparse.Namespace):
+    """Report argument values run_experiment cannot handle through parser.error."""
+    if args.repeats < 1:
+        parser.error("--repeats must be at least 1.")
+    if args.warmup < 0:
+        parser.error("--warmup cannot be negative.")
+    if args.validate_oracle and "SortedArray" not in STRUCTURE_CLASSES:
+        parser.error("--validate-oracle needs numpy for the sorted-array oracle.")
+    if args.dataset and not Path(args.dataset).is_file():
+        parser.error(f"Dataset file '{args.dataset}' does not exist.")
+
+
+def experiment_parameters(args: argparse.Namespace) -> Dict[str, Any]:
+    """The arguments that determine an experiment's results, used for its parameter hash."""
+    return {
+        "dataset": args.dataset or "synthetic",
+        "sample_size": args.sample_size,
+        "search_trials": args.search_trials,
+        "delete_ratio": args.delete_ratio,
+        "seed": args.seed,
+        "repeats": args.repeats,
+        "warmup": args.warmup,
+        "gc_disabled": args.disable_gc,
+        "timer_correction": not args.no_timer_correction,
+        "memory": not args.no_memory,
+        "workload": args.workload,
+        "operations": args.operations if args.workload or args.validate_oracle else None,
+        "arrival": args.arrival,
+        "zipf_s": args.zipf_s,
+        "cache_size": args.cache_size if args.workload else None,
+        "validate_oracle": args.validate_oracle,
+    }
+
+
+def run_experiment(
+    args: argparse.Namespace,
+    posts: Sequence,
+    timer_overhead: float,
+    verbose: bool = True,
+) -> Dict[str, Any]:
+    """Run every structure on the posts and return the metrics payload."""
     results = {}
     for structure in STRUCTURE_ORDER:
-        trial_rng = random.Random(args.seed)
         feed_cls = STRUCTURE_CLASSES[structure]
-        results[structure] = run_trial(feed_cls, posts, args.search_trials, args.delete_ratio, trial_rng)
+        results[structure] = run_measured_trial(
+            feed_cls,
+            posts,
+            args.search_trials,
+            args.delete_ratio,
+            args.seed,
+            repeats=args.repeats,
+            warmup=args.warmup,
+            disable_gc=args.disable_gc,
+            timer_overhead=timer_overhead,
+            measure_memory=not args.no_memory,
+        )
 
-    print_results_table(results, STRUCTURE_ORDER)
+    if verbose:
+        print_results_table(results, STRUCTURE_ORDER)
 
     metadata: Mapping[str, object] = {
         "dataset": args.dataset or "synthetic",
@@ -59,20 +152,94 @@ def main():
         "search_trials": args.search_trials,
         "delete_ratio": args.delete_ratio,
         "seed": args.seed,
+        "repeats": args.repeats,
+        "warmup": args.warmup,
+        "gc_disabled": args.disable_gc,
+        "pinned_cpu": args.pin_cpu,
+        "timer_overhead": timer_overhead,
+        "parameters": experiment_parameters(args),
+        "param_hash": parameter_hash(experiment_parameters(args)),
         "created_at": datetime.now(timezone.utc).isoformat(),
     }
 
     metrics_payload = {"metadata": metadata, "results": results}
-    output_dir = Path(args.output_dir)
-    if args.output_file:
-        metrics_path = Path(args.output_file)
-    else:
-        output_dir.mkdir(parents=True, exist_ok=True)
-        metrics_path = output_dir / "metrics.json"
 
+    if args.workload:
+        workload = dict(WORKLOAD_PRESETS[args.workload])
+        if args.arrival:
+            workload["arrival"] = args.arrival
+        if args.zipf_s is not None:
+            workload["zipf_s"] = args.zipf_s
+
+        workload_results = {}
+        for structure in STRUCTURE_ORDER:
+            feed_cls = STRUCTURE_CLASSES[structure]
+            workload_results[structure] = run_workload(
+                feed_cls, posts, workload, args.operations, random.Random(args.seed)
+            )
+            if args.cache_size > 0:
+                workload_results[f"{structure} (cached)"] = run_workload(
+                    feed_cls, posts, workload, args.operations, random.Random(args.seed), cache_size=args.cache_size
+                )
+
+        if verbose:
+            print(f"\nMixed workload '{args.workload}' ({args.operations} ops, {workload['arrival']} arrival):")
+            print_workload_table(workload_results, list(workload_results))
+        metrics_payload["workload"] = {
+            "preset": args.workload,
+            "operations": args.operations,
+            "cache_size": args.cache_size,
+            "spec": workload,
+            "results": workload_results,
+        }
+    if args.validate_oracle:
+        oracle_results = {}
+        for structure in STRUCTURE_ORDER:
+            if structure == "SortedArray":
+                continue
+            oracle_results[structure] = validate_against_oracle(
+                STRUCTURE_CLASSES[structure], posts, args.operations, random.Random(args.seed)
+            )
+            if verbose:
+                outcome = oracle_results[structure]
+                print(
+                    f"\nOracle check {structure}: {outcome['checks']} reads over {outcome['operations']} ops, "
+                    f"{outcome['mismatches']} mismatches"
+                )
+        metrics_payload["oracle"] = oracle_results
+    return metrics_payload
+
+
+def write_metrics(metrics_payload: Mapping[str, Any], metrics_path: Path):
+    """Write the payload atomically so an interrupted run never leaves a partial file."""
     metrics_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(metrics_path, "w", encoding="utf-8") as f:
+    tmp_path = metrics_path.with_name(metrics_path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
         json.dump(metrics_payload, f, indent=2)
+    os.replace(tmp_path, metrics_path)
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    validate_args(parser, args)
+
+    if args.pin_cpu is not None:
+        pin_cpu(args.pin_cpu)
+    timer_overhead = 0.0 if args.no_timer_correction else calibrate_timer_overhead()
+
+    if args.dataset:
+        posts = load_posts(args.dataset, args.sample_size)
+    else:
+        posts = generate_synthetic_posts(args.sample_size, args.seed)
+
+    metrics_payload = run_experiment(args, posts, timer_overhead)
+
+    if args.output_file:
+        metrics_path = Path(args.output_file)
+    else:
+        metrics_path = Path(args.output_dir) / "metrics.json"
+    write_metrics(metrics_payload, metrics_path)
 
     print(f"\nMetrics saved to {metrics_path}")
     print(f"Plot them with `python3 run_experiments_plot.py --metrics-file {metrics_path}`")
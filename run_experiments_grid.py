@@ -1,12 +1,30 @@
 #!/usr/bin/env python3
-"""Run run_experiments_create.py across multiple argument combinations."""
+"""Run the run_experiments_create.py experiment across multiple argument combinations in-process."""
 
 import argparse
 import itertools
-import subprocess
-import sys
+import json
+import multiprocessing
+import shlex
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
+from run_experiments_common import (
+    calibrate_timer_overhead,
+    generate_synthetic_posts,
+    load_posts,
+    parameter_hash,
+)
+from run_experiments_create import build_parser, experiment_parameters, run_experiment, validate_args, write_metrics
+
+# Dataset prefix shared with the workers. Forked workers inherit it from the
+# parent; on platforms without fork it is shipped once per worker instead.
+_SHARED_POSTS = None
+_TIMER_OVERHEAD = 0.0
+
+# run_experiments_create.py arguments the grid sets itself for every combination.
+GRID_OWNED_ARGS = ("sample_size", "search_trials", "delete_ratio", "seed", "dataset", "output_file", "output_dir")
+
 
 def parse_args():
     parser = argparse.ArgumentParser(
@@ -16,7 +34,7 @@ def parse_args():
         "--dataset",
         type=str,
         default=None,
-        help="Optional dataset file passed to run_experiments_create.py.",
+        help="Optional dataset file, loaded once and shared by every run.",
     )
     parser.add_argument(
         "--sample-sizes",
@@ -53,12 +71,42 @@ def parse_args():
         help="Directory under which all metrics.json files will be stored.",
     )
     parser.add_argument(
-        "--python",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes running combinations in parallel (default: 1).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rerun combinations even if a result with the same parameter hash exists.",
+    )
+    parser.add_argument(
+        "--extra-args",
         type=str,
-        default=sys.executable,
-        help="Python executable used to invoke run_experiments_create.py.",
+        default="",
+        help="Extra run_experiments_create.py arguments applied to every run, e.g. \"--repeats 5 --disable-gc\".",
     )
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1.")
+    args.extra_args = shlex.split(args.extra_args)
+    check_extra_args(parser, args.extra_args)
+    return parser, args
+
+
+def check_extra_args(parser: argparse.ArgumentParser, extra_args):
+    """Reject --extra-args that would override what the grid sets per combination."""
+    # argparse leaves attributes already on the namespace alone unless the argument is passed.
+    unset = object()
+    namespace = argparse.Namespace(**{dest: unset for dest in (*GRID_OWNED_ARGS, "pin_cpu")})
+    build_parser().parse_args(extra_args, namespace)
+    owned = [f"--{dest.replace('_', '-')}" for dest in GRID_OWNED_ARGS if getattr(namespace, dest) is not unset]
+    if owned:
+        parser.error(f"{', '.join(owned)} cannot be passed in --extra-args, use the grid's own arguments.")
+    if namespace.pin_cpu is not unset:
+        # Workers share the machine's CPUs; pin the whole sweep with taskset instead.
+        parser.error("--pin-cpu is not supported in --extra-args, the grid runs combinations in parallel.")
 
 
 def format_ratio(value: float) -> str:
@@ -68,8 +116,37 @@ def format_ratio(value: float) -> str:
     return str(value).replace(".", "p")
 
 
+def _init_worker(posts, timer_overhead):
+    global _SHARED_POSTS, _TIMER_OVERHEAD
+    _SHARED_POSTS = posts
+    _TIMER_OVERHEAD = timer_overhead
+
+
+def _is_complete(metrics_path: Path, expected_hash: str) -> bool:
+    if not metrics_path.is_file():
+        return False
+    try:
+        with open(metrics_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except ValueError:
+        return False
+    return data.get("metadata", {}).get("param_hash") == expected_hash
+
+
+def run_combination(create_argv, metrics_path):
+    """Run one combination against the shared dataset and write its metrics file."""
+    args = build_parser().parse_args(create_argv)
+    if args.dataset:
+        posts = _SHARED_POSTS[: args.sample_size]
+    else:
+        posts = generate_synthetic_posts(args.sample_size, args.seed)
+    payload = run_experiment(args, posts, _TIMER_OVERHEAD, verbose=False)
+    write_metrics(payload, Path(metrics_path))
+    return metrics_path
+
+
 def main():
-    args = parse_args()
+    parser, args = parse_args()
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -82,16 +159,15 @@ def main():
         print("No parameter combinations to run.")
         return 1
 
+    pending = []
+    create_parser = build_parser()
     for sample_size, search_trials, delete_ratio, seed in combinations:
         delete_str = format_ratio(delete_ratio)
         metrics_path = (
             output_dir
             / f"metrics_sample{sample_size}_search{search_trials}_delete{delete_str}_seed{seed}.json"
         )
-
-        cmd = [
-            args.python,
-            "run_experiments_create.py",
+        create_argv = [
             "--sample-size",
             str(sample_size),
             "--search-trials",
@@ -100,16 +176,49 @@ def main():
             str(delete_ratio),
             "--seed",
             str(seed),
-            "--output-file",
-            str(metrics_path),
+            *args.extra_args,
         ]
         if args.dataset:
-            cmd.extend(["--dataset", args.dataset])
+            create_argv.extend(["--dataset", args.dataset])
+
+        create_args = create_parser.parse_args(create_argv)
+        validate_args(parser, create_args)
+        expected_hash = parameter_hash(experiment_parameters(create_args))
+        if not args.force and _is_complete(metrics_path, expected_hash):
+            print(f"Skipping {metrics_path} (already complete, hash {expected_hash})")
+            continue
+        pending.append((create_argv, str(metrics_path)))
 
-        print("\n=== Running", " ".join(cmd), "===")
-        subprocess.run(cmd, check=True)
+    posts = None
+    if args.dataset and pending:
+        posts = load_posts(args.dataset, max(args.sample_sizes))
+    timer_overhead = calibrate_timer_overhead()
+    _init_worker(posts, timer_overhead)
 
-    print(f"\nCompleted {len(combinations)} experimental runs. Metrics saved in {output_dir}.")
+    if args.jobs == 1:
+        for create_argv, metrics_path in pending:
+            print("=== Running", " ".join(create_argv), "===")
+            run_combination(create_argv, metrics_path)
+    elif pending:
+        if "fork" in multiprocessing.get_all_start_methods():
+            executor = ProcessPoolExecutor(max_workers=args.jobs, mp_context=multiprocessing.get_context("fork"))
+        else:
+            executor = ProcessPoolExecutor(
+                max_workers=args.jobs, initializer=_init_worker, initargs=(posts, timer_overhead)
+            )
+        with executor:
+            futures = {
+                executor.submit(run_combination, create_argv, metrics_path): create_argv
+                for create_argv, metrics_path in pending
+            }
+            for future in as_completed(futures):
+                print("=== Finished", " ".join(futures[future]), "->", future.result(), "===")
+
+    skipped = len(combinations) - len(pending)
+    print(
+        f"\nCompleted {len(pending)} experimental runs ({skipped} already complete). "
+        f"Metrics saved in {output_dir}."
+    )
     return 0
 
 
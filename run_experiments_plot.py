@@ -4,31 +4,52 @@ from pathlib import Path
 
 import matplotlib.pyplot as plt
 
-from run_experiments_common import TIME_METRIC_KEYS, print_results_table
+from run_experiments_common import MEMORY_METRIC_KEYS, TIME_METRIC_KEYS, print_results_table
+
+
+def _confidence_errors(results, structures, metric):
+    """Asymmetric error bars from the 95% CI recorded by the measurement harness, if any."""
+    lower, upper = [], []
+    for name in structures:
+        summary = results[name].get("Statistics", {}).get(metric)
+        value = results[name][metric]
+        if summary is None:
+            lower.append(0.0)
+            upper.append(0.0)
+        else:
+            lower.append(max(value - summary["ci95_low"], 0.0))
+            upper.append(max(summary["ci95_high"] - value, 0.0))
+    return [lower, upper]
 
 
 def plot_results(results, output_path: Path):
-    structures = [name for name in ("BST", "Treap") if name in results]
+    structures = list(results)
     if not structures:
         raise ValueError("No structures found in the metrics file.")
 
-    fig, axes = plt.subplots(1, 2, figsize=(12, 5))
+    memory_keys = [key for key in MEMORY_METRIC_KEYS[:3] if all(key in results[name] for name in structures)]
+    panels = 3 if memory_keys else 2
+    fig, axes = plt.subplots(1, panels, figsize=(6 * panels, 5))
     x = range(len(structures))
     width = 0.25
+    time_keys = [key for key in TIME_METRIC_KEYS if all(key in results[name] for name in structures)]
+    time_width = 0.8 / len(time_keys)
 
-    for idx, metric in enumerate(TIME_METRIC_KEYS):
-        offsets = [pos + width * (idx - 1) for pos in x]
+    for idx, metric in enumerate(time_keys):
+        offsets = [pos + time_width * (idx - (len(time_keys) - 1) / 2) for pos in x]
         axes[0].bar(
             offsets,
             [results[name][metric] for name in structures],
-            width=width,
+            width=time_width,
             label=metric,
+            yerr=_confidence_errors(results, structures, metric),
+            capsize=3,
         )
     axes[0].set_xticks(list(x))
     axes[0].set_xticklabels(structures)
     axes[0].set_ylabel("Seconds")
     axes[0].set_title("Average Operation Time")
-    axes[0].legend()
+    axes[0].legend(fontsize="small")
 
     axes[1].bar(x, [results[name]["Height of the Tree"] for name in structures], width=width, label="Height")
     axes[1].bar(
@@ -43,6 +64,21 @@ def plot_results(results, output_path: Path):
     axes[1].set_title("Structural Metrics")
     axes[1].legend()
 
+    if memory_keys:
+        for idx, metric in enumerate(memory_keys):
+            offsets = [pos + width * (idx - 1) for pos in x]
+            axes[2].bar(
+                offsets,
+                [results[name][metric] / 1024 for name in structures],
+                width=width,
+                label=metric.replace(" (bytes)", ""),
+            )
+        axes[2].set_xticks(list(x))
+        axes[2].set_xticklabels(structures)
+        axes[2].set_ylabel("KiB")
+        axes[2].set_title("Memory Footprint")
+        axes[2].legend()
+
     fig.tight_layout()
     axes_path = output_path
     fig.savefig(axes_path, dpi=200, bbox_inches="tight")
@@ -50,18 +86,7 @@ def plot_results(results, output_path: Path):
     return axes_path
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Plot the metrics generated by run_experiments_create.py.")
-    parser.add_argument("--metrics-file", required=True, help="Path to the JSON file produced by the creation script.")
-    parser.add_argument(
-        "--output-file",
-        type=str,
-        default="results/benchmark.png",
-        help="File path where the visualization image will be written.",
-    )
-    args = parser.parse_args()
-
-    metrics_path = Path(args.metrics_file)
+def plot_metrics_file(metrics_path: Path, output_path: Path, verbose: bool = True) -> Path:
     if not metrics_path.exists():
         raise FileNotFoundError(f"Metrics file does not exist: {metrics_path}")
 
@@ -70,17 +95,52 @@ def main():
 
     results = data.get("results", {})
     metadata = data.get("metadata", {})
-    print("Experiment metadata:")
-    for key, value in metadata.items():
-        print(f"  {key}: {value}")
+    if verbose:
+        print("Experiment metadata:")
+        for key, value in metadata.items():
+            print(f"  {key}: {value}")
 
-    structures = [name for name in ("BST", "Treap") if name in results]
-    print_results_table(results, structures)
+        structures = list(results)
+        print_results_table(results, structures)
 
-    output_path = Path(args.output_file)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    plot_path = plot_results(results, output_path)
-    print(f"\nVisualization saved to {plot_path}")
+    return plot_results(results, output_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plot the metrics generated by run_experiments_create.py.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--metrics-file", help="Path to the JSON file produced by the creation script.")
+    source.add_argument(
+        "--batch-dir",
+        help="Plot every JSON file in this directory in one process, one PNG per file.",
+    )
+    parser.add_argument(
+        "--output-file",
+        type=str,
+        default="results/benchmark.png",
+        help="File path where the visualization image will be written.",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default="results",
+        help="Directory for the per-file images written in --batch-dir mode.",
+    )
+    args = parser.parse_args()
+
+    if args.metrics_file:
+        plot_path = plot_metrics_file(Path(args.metrics_file), Path(args.output_file))
+        print(f"\nVisualization saved to {plot_path}")
+        return
+
+    batch_files = sorted(Path(args.batch_dir).glob("*.json"))
+    if not batch_files:
+        raise FileNotFoundError(f"No metrics files found in {args.batch_dir}")
+    output_dir = Path(args.output_dir)
+    for metrics_path in batch_files:
+        plot_path = plot_metrics_file(metrics_path, output_dir / f"{metrics_path.stem}.png", verbose=False)
+        print(f"Processing: {metrics_path} -> {plot_path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,130 @@
+import random
+import unittest
+
+from main import BSTFeed, SortedArrayFeed, TreapFeed
+
+FEED_CLASSES = [BSTFeed, TreapFeed]
+if SortedArrayFeed.available():
+    FEED_CLASSES.append(SortedArrayFeed)
+
+
+def ids(posts):
+    return [post.postid for post in posts]
+
+
+class FeedReadCacheTest(unittest.TestCase):
+    def make_feed(self, feed_cls):
+        feed = feed_cls(cache_size=16)
+        for idx in range(10):
+            feed.addPost(f"p{idx}", 100 + idx * 10, idx)
+        return feed
+
+    def assert_hit(self, feed, read):
+        hits = feed.stats["cache_hit_count"]
+        read()
+        self.assertEqual(feed.stats["cache_hit_count"], hits + 1)
+
+    def assert_miss(self, feed, read):
+        misses = feed.stats["cache_miss_count"]
+        read()
+        self.assertEqual(feed.stats["cache_miss_count"], misses + 1)
+
+    def test_non_positive_k_is_not_cached(self):
+        for feed_cls in FEED_CLASSES:
+            with self.subTest(feed=feed_cls.__name__):
+                feed = self.make_feed(feed_cls)
+                self.assertEqual(feed.getMostRecent(0), [])
+                self.assertEqual(feed.getMostRecent(-3), [])
+                feed.addPost("new", 500, 1)
+                feed.deletePost("new")
+                self.assertEqual(feed.getMostRecent(0), [])
+
+    def test_empty_feed_results_are_invalidated_by_insert(self):
+        for feed_cls in FEED_CLASSES:
+            with self.subTest(feed=feed_cls.__name__):
+                feed = feed_cls(cache_size=16)
+                self.assertEqual(feed.getMostRecent(3), [])
+                self.assertIsNone(feed.getMostPopular())
+                feed.addPost("only", 100, 5)
+                self.assertEqual(ids(feed.getMostRecent(3)), ["only"])
+                self.assertEqual(feed.getMostPopular().postid, "only")
+
+    def test_like_keeps_recent(self):
+        for feed_cls in FEED_CLASSES:
+            with self.subTest(feed=feed_cls.__name__):
+                feed = self.make_feed(feed_cls)
+                feed.getMostRecent(3)
+                feed.likePost("p9")
+                self.assert_hit(feed, lambda: feed.getMostRecent(3))
+
+    def test_insert_older_than_window_keeps_recent(self):
+        for feed_cls in FEED_CLASSES:
+            with self.subTest(feed=feed_cls.__name__):
+                feed = self.make_feed(feed_cls)
+                feed.getMostRecent(3)
+                feed.addPost("old", 105, 0)
+                self.assert_hit(feed, lambda: feed.getMostRecent(3))
+                feed.addPost("newest", 500, 0)
+                self.assert_miss(feed, lambda: feed.getMostRecent(3))
+                self.assertEqual(ids(feed.getMostRecent(3)), ["newest", "p9", "p8"])
+
+    def test_delete_only_invalidates_recent_inside_window(self):
+        for feed_cls in FEED_CLASSES:
+            with self.subTest(feed=feed_cls.__name__):
+                feed = self.make_feed(feed_cls)
+                feed.getMostRecent(3)
+                feed.deletePost("p0")
+                self.assert_hit(feed, lambda: feed.getMostRecent(3))
+                feed.deletePost("p8")
+                self.assert_miss(feed, lambda: feed.getMostRecent(3))
+                self.assertEqual(ids(feed.getMostRecent(3)), ["p9", "p7", "p6"])
+
+    def test_popular_invalidation(self):
+        for feed_cls in FEED_CLASSES:
+            with self.subTest(feed=feed_cls.__name__):
+                feed = self.make_feed(feed_cls)
+                self.assertEqual(feed.getMostPopular().postid, "p9")
+                feed.addPost("low", 50, 1)
+                feed.likePost("p7")
+                feed.deletePost("p0")
+                self.assert_hit(feed, feed.getMostPopular)
+
+                # Catching up with the cached winner may change the tie-break.
+                feed.likePost("p8")
+                self.assert_miss(feed, feed.getMostPopular)
+                feed.addPost("viral", 60, 100)
+                self.assertEqual(feed.getMostPopular().postid, "viral")
+                feed.deletePost("viral")
+                self.assertEqual(feed.getMostPopular().score, 9)
+
+    def test_cached_reads_match_uncached(self):
+        for feed_cls in FEED_CLASSES:
+            with self.subTest(feed=feed_cls.__name__):
+                rng = random.Random(7)
+                cached, plain = feed_cls(cache_size=8), feed_cls()
+                live = []
+                for step in range(4000):
+                    roll = rng.random()
+                    if roll < 0.3 or not live:
+                        post = (f"p{step}", rng.randint(0, 500), rng.randint(0, 20))
+                        cached.addPost(*post)
+                        plain.addPost(*post)
+                        live.append(post[0])
+                    elif roll < 0.5:
+                        postid = rng.choice(live)
+                        cached.likePost(postid)
+                        plain.likePost(postid)
+                    elif roll < 0.6:
+                        postid = live.pop(rng.randrange(len(live)))
+                        cached.deletePost(postid)
+                        plain.deletePost(postid)
+                    elif roll < 0.8:
+                        k = rng.randint(1, 6)
+                        self.assertEqual(ids(cached.getMostRecent(k)), ids(plain.getMostRecent(k)))
+                    else:
+                        self.assertEqual(cached.getMostPopular().score, plain.getMostPopular().score)
+                self.assertGreater(cached.stats["cache_hit_count"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()